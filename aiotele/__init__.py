@@ -12,6 +12,19 @@ from .types import *
 from .keyboards import *
 from .exceptions import *
 from .transitions import *
+from .dispatcher import *
+from .ratelimit import *
+from .retry import *
+from .filters import *
+from .callback_data import *
+from .middlewares import *
+from .fsm import *
+from .throttling import *
+from .input_file import *
+from .file_cache import *
+from .download import *
+from .media import *
+from .broadcast import *
 
 __author__ = "Bogdan Boris"
 __version__ = "0.1.3"
@@ -1,138 +1,193 @@
 import aiohttp.client_exceptions
 import aiohttp.http_exceptions
 import aiohttp.web
-from aiotele.types import MessageObject, GetChat, CommandObject, GetMe, CallbackQuery, NewChatMember, LeaveChatMember
+from aiotele.types import MessageObject, GetChat, CommandObject, GetMe, File, CallbackQuery, NewChatMember, LeaveChatMember, Update, TelegramObject, UPDATE_TYPES, MESSAGE_UPDATE_TYPES
 import aiohttp
 import asyncio
 
 from aiotele import loggers
 
 import ssl
-import certifi
 
+import contextvars
+import hmac
 import inspect
 from contextlib import suppress
+from functools import partial
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Union
 from .exceptions import *
 from .transitions import JOIN_TRANSITION, LEAVE_TRANSITION
+from .dispatcher import Dispatcher
+from .client import TelegramClient, WebhookReply, current_webhook_reply
+from .input_file import InputFile, Source
+from .file_cache import FileIdCache
+from .download import Destination, Downloaded, save_stream
+from .media import InputMedia, send_media_group, send_photo
+from .broadcast import Broadcast, BroadcastStats, Recipients
+from .router import CommandRouter, FilterRouter, PrefixTrie, Route, make_route
+from .callback_data import CallbackData, CallbackDataQuery
+from .filters import CallbackDataFilter, Command, Filter, all_of
+from .middlewares import Middleware, MiddlewareManager
+from .codecs import JsonDumps, JsonLoads, json_dumps, json_loads
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .fsm import BaseStorage, FSMMiddleware
+from .throttling import ThrottlingMiddleware
+
+async def call_handler(handler, *args, data: Optional[dict]=None) -> None:
+    kwargs = {}
+    if data:
+        # Значения, добавленные мидлварями, передаются по именам keyword-only параметров
+        route = make_route(handler)
+        if route.takes_kwargs:
+            kwargs = {name: value for name, value in data.items() if name not in ("handler", "handler_args")}
+        elif route.inject:
+            kwargs = {name: data[name] for name in route.inject if name in data}
+    result = await handler(*args, **kwargs)
+    if inspect.isawaitable(result):
+        # Хендлер вернул неотправленный вызов API - в режиме вебхука он уйдёт в теле ответа
+        reply = current_webhook_reply.get()
+        if reply is not None:
+            reply.armed = True
+        try:
+            await result
+        finally:
+            if reply is not None:
+                reply.armed = False
+
+async def _call_handler_from_chain(event, data: dict) -> None:
+    await call_handler(data["handler"], event, *data["handler_args"], data=data)
+
+def make_invoke(chain):
+    """Вызов хендлера через скомпилированную цепочку внутренних мидлварей."""
+    async def invoke(handler, event, *args, data: Optional[dict]=None) -> None:
+        data = dict(data) if data else {}
+        data["handler"] = handler
+        data["handler_args"] = args
+        await chain(event, data)
+    return invoke
 
 class CommandHandler:
-    def __init__(self, token: str):
-        self.commands = {}
+    def __init__(self, token: str, client: TelegramClient=None):
+        self.router = CommandRouter()
+        self.filters = FilterRouter()
         self.__token = token
-        self.default_handler = None  # Хендлер для любого сообщения
+        self.__client = client
+        self.invoke = call_handler  # Заменяется цепочкой мидлварей в Bot.compile_handlers
 
-    def command(self, command: str = None, commands: List[str] = None, prefix: str = None):
+    @property
+    def commands(self) -> dict:
+        return {key: route.handler for key, route in self.router.table.items()}
+
+    @property
+    def default_handler(self):
+        return self.router.default.handler if self.router.default else None
+
+    @property
+    def registered(self) -> bool:
+        return bool(self.router.table or self.router.default or len(self.filters))
+
+    def command(self, command: str = None, commands: List[str] = None, prefix: str = None, filters=None):
         def wrapper(func):
-            if command is None and commands is None:
-                self.default_handler = func  # Устанавливаем обработчик для любого текста
-            elif command is None and commands:
-                for _command in commands:
-                    if prefix != None:
-                        for i in prefix:
-                            _command = i + _command
-                            self.commands[_command] = func
-            elif isinstance(command, str):
-                if prefix != None:
-                    for i in prefix:
-                        _command = i + command
-                        self.commands[_command] = func
-                else:
-                    _command = command
-                    self.commands[_command] = func
+            names = ([command] if command is not None else []) + list(commands or [])
+            if filters is not None:
+                # Команда с фильтрами проверяется вместе с ними в роутере фильтров
+                rules = [filters] if isinstance(filters, Filter) else list(filters)
+                if names:
+                    rules.append(Command(*names, prefix=tuple(prefix) if prefix else ("",)))
+                self.filters.register(func, all_of(*rules))
+            elif not names:
+                self.router.set_default(func)  # Устанавливаем обработчик для любого текста
+            else:
+                # Команда и её алиасы; каждый префикс (например, "/!") даёт свой вариант
+                self.router.register(func, names, prefix)
             return func
         return wrapper
 
-    async def handle(self, update, bot):
+    async def handle(self, update, bot, data: Optional[dict]=None):
         message = update.get("message", {})
-        text = message.get("text", "")
-        command = text.split(" ")[0]
-
-        # Проверяем, есть ли обработчик для команды или общий обработчик для любого сообщения
-        handler = self.commands.get(command, self.default_handler)
+        text = message.get("text")
+        # Сначала точная команда, затем хендлеры с фильтрами, затем общий обработчик для любого текста
+        route = self.router.lookup(text) if text is not None else None
+        if route is None:
+            route = self.filters.resolve(message)
+        if route is None and text is not None:
+            route = self.router.default
 
-        if handler:
-            from_info = message.get("from", {})
-            username = from_info.get("username", None)
-            user_id = from_info.get("id", 0)
-            full_name = f"{from_info.get('first_name', '')} {from_info.get('last_name', '')}".strip()
-            chat = message.get("chat", {})
-            type_chat = chat.get("type", None)
-            title = chat.get("title", None)
-            chat_username = chat.get("username", None)
-            chat_id = chat.get("id", 0)
-            message_id = message.get("message_id", 0)
-
-            reply_to_info = message.get("reply_to_message", {})
-            reply_to_message_id = reply_to_info.get("message_id", None)
-            reply_to_from_info = reply_to_info.get("from", {})
-            reply_is_bot = reply_to_from_info.get("is_bot", None)
-            reply_to_user_id = reply_to_from_info.get("id", None)
-            reply_to_full_name = f"{reply_to_from_info.get('first_name', '')} {reply_to_from_info.get('last_name', '')}".strip()
-            
-            msg_obj = MessageObject(
-                fullname=full_name,
-                is_bot=from_info.get("is_bot", None),
-                reply_is_bot=reply_is_bot,
-                language_code=from_info.get("language_code", None),
-                reply_language_code=reply_to_from_info.get("language_code", None),
-                username=username,
-                user_id=user_id,
-                chat_id=chat_id,
-                message_id=message_id,
-                reply_to_message_fullname=reply_to_full_name,
-                reply_to_message_user_id=reply_to_user_id,
-                reply_to_message_message_id=reply_to_message_id,
-                token=self.__token,
-                type_chat=type_chat,
-                title=title,
-                chat_username=chat_username,
-                message_text=text
-            )
-            command_obj = CommandObject(
-                text_message=text,
-            )
-            sig = inspect.signature(handler)
-            params = len(sig.parameters)
-            if params == 1:
-                await handler(msg_obj)
+        if route:
+            msg_obj = MessageObject.from_dict(message, token=self.__token, client=self.__client)
+            if route.pass_command:
+                command_obj = CommandObject(
+                    text_message=text or "",
+                )
+                await self.invoke(route.handler, msg_obj, command_obj, data=data)
             else:
-                await handler(msg_obj, command_obj)
+                await self.invoke(route.handler, msg_obj, data=data)
 
 class CallbackDataHandler:
-    def __init__(self, token: str):
+    def __init__(self, token: str, client: TelegramClient=None):
         self.commands = {}
+        self.filters = FilterRouter()
+        self.namespaces = PrefixTrie()  # {пространство имён CallbackData: (фильтр, Route, схема)}
         self.__token = token
+        self.__client = client
+        self.invoke = call_handler  # Заменяется цепочкой мидлварей в Bot.compile_handlers
         self.default_handler = None  # Хендлер для любого сообщения
 
-    def callback(self, command: str = None):
+    @property
+    def registered(self) -> bool:
+        return bool(self.commands or self.default_handler or len(self.filters) or len(self.namespaces))
+
+    def callback(self, command: Union[str, CallbackData, CallbackDataQuery] = None, filters=None):
         def wrapper(func):
-            if command is None:
-                self.default_handler = func  # Устанавливаем обработчик для любого текста
+            query = command.filter() if isinstance(command, CallbackData) else command
+            rules = [] if filters is None else [filters] if isinstance(filters, Filter) else list(filters)
+            if isinstance(query, CallbackDataQuery):
+                # Хендлеры схем ищутся по префиксному дереву пространств имён
+                self.namespaces.insert(query.schema.namespace, (all_of(query, *rules), make_route(func), query.schema))
+            elif rules:
+                if command is not None:
+                    rules.append(CallbackDataFilter(equals=command))
+                self.filters.register(func, all_of(*rules))
             elif command is None:
-                _command = i + _command
-                self.commands[_command] = func
+                self.default_handler = func  # Устанавливаем обработчик для любого текста
             elif isinstance(command, str):
                 self.commands[command] = func
             return func
         return wrapper
 
-    async def handle(self, update, bot):
+    async def handle(self, update, bot, data: Optional[dict]=None):
         message = update.get("message", {})
         callback = update.get("callback_query", None)
         command = callback.get("data", None)
 
-        # Проверяем, есть ли обработчик для команды или общий обработчик для любого сообщения
-        handler = self.commands.get(command, self.default_handler)
+        # Точное совпадение, затем схемы CallbackData, хендлеры с фильтрами и общий обработчик
+        handler = self.commands.get(command)
+        values = None
+        if handler is None and command is not None and len(self.namespaces):
+            for rule, route, schema in self.namespaces.match(command):
+                if rule.check(callback):
+                    handler = route.handler
+                    if route.pass_command:
+                        values = schema.parse(command)
+                    break
+        if handler is None:
+            route = self.filters.resolve(callback)
+            handler = route.handler if route is not None else self.default_handler
 
         if handler:
-            callback_obj = CallbackQuery(callback, self.__token)
-            await handler(callback_obj)
+            callback_obj = CallbackQuery(callback, self.__token, client=self.__client)
+            if values is not None:
+                await self.invoke(handler, callback_obj, values, data=data)
+            else:
+                await self.invoke(handler, callback_obj, data=data)
 
 class ChatMemberHandler:
-    def __init__(self, token: str):
+    def __init__(self, token: str, client: TelegramClient=None):
         self.__token = token
+        self.__client = client
+        self.invoke = call_handler  # Заменяется цепочкой мидлварей в Bot.compile_handlers
         self.handlers = {}  # Словарь для хранения обработчиков: {индикатор: функция}
 
     def chat_member(self, indicator: int):
@@ -142,7 +197,7 @@ class ChatMemberHandler:
             return func
         return wrapper
 
-    async def handle(self, update, indicator: int, bot_id: int):
+    async def handle(self, update, indicator: int, bot_id: int, data: Optional[dict]=None):
         """Обработка события с учётом индикатора"""
         message = update.get("message", {})
         new_chat_members = message.get("new_chat_members", [])
@@ -157,32 +212,40 @@ class ChatMemberHandler:
                     for new_member in new_chat_members:
                         if new_member.get("id") == bot_id:
                             continue
-                        await handler(
+                        await self.invoke(
+                            handler,
                             NewChatMember(
                                 new_member=new_member,
                                 old_member=message.get("from", {}),
                                 chat=chat,
                                 message_id=message.get("message_id"),
                                 token=self.__token,
-                            )
+                                client=self.__client,
+                            ),
+                            data=data,
                         )
         elif leave_chat_member:
-            if indicator == LEAVE_TRANSITION:
+            if indicator == LEAVE_TRANSITION and handler:
                 if leave_chat_member.get("id") == bot_id:
                     return
-                await handler(
+                await self.invoke(
+                    handler,
                     LeaveChatMember(
                         leave_member=leave_chat_member,
                         administrator=message.get("from", {}),
                         chat=chat,
                         message_id=message.get("message_id"),
                         token=self.__token,
-                    )
+                        client=self.__client,
+                    ),
+                    data=data,
                 )
 
 class MyChatMemberHandler:
-    def __init__(self, token: str):
+    def __init__(self, token: str, client: TelegramClient=None):
         self.__token = token
+        self.__client = client
+        self.invoke = call_handler  # Заменяется цепочкой мидлварей в Bot.compile_handlers
         self.handlers = {}  # Словарь для хранения обработчиков: {индикатор: функция}
 
     def my_chat_member(self, indicator: int):
@@ -192,7 +255,7 @@ class MyChatMemberHandler:
             return func
         return wrapper
     
-    async def handle(self, update, indicator: int, bot_id: int):
+    async def handle(self, update, indicator: int, bot_id: int, data: Optional[dict]=None):
         """Обработка события с учётом индикатора"""
         message = update.get("message", {})
         new_chat_members = message.get("new_chat_members", [])
@@ -205,49 +268,194 @@ class MyChatMemberHandler:
                 if indicator == JOIN_TRANSITION:
                     for new_member in new_chat_members:
                         if new_member.get("id") == bot_id:
-                            await handler(
+                            await self.invoke(
+                                handler,
                                 NewChatMember(
                                     new_member=new_member,
                                     old_member=message.get("from", {}),
                                     chat=chat,
                                     message_id=message.get("message_id"),
                                     token=self.__token,
-                                )
+                                    client=self.__client,
+                                ),
+                                data=data,
                             )
                             break
 
+class UpdateHandler:
+    """Хендлеры остальных типов апдейтов: edited_message, channel_post, inline_query, poll, ..."""
+
+    def __init__(self, token: str, client: TelegramClient=None):
+        self.__token = token
+        self.__client = client
+        self.invoke = call_handler  # Заменяется цепочкой мидлварей в Bot.compile_handlers
+        self.routers: Dict[str, FilterRouter] = {}  # {тип апдейта: хендлеры с фильтрами}
+        self.defaults: Dict[str, Route] = {}  # {тип апдейта: хендлер без фильтров}
+
+    @property
+    def update_types(self) -> Set[str]:
+        return set(self.routers) | set(self.defaults)
+
+    def register(self, update_type: str, filters=None):
+        if update_type not in UPDATE_TYPES:
+            raise ValidationError(f"Unknown update type {update_type!r}")
+        if update_type in ("message", "callback_query"):
+            raise ValidationError(f"Use message_handler/callback_handler for {update_type!r} updates")
+        def wrapper(func):
+            if filters is None:
+                self.defaults[update_type] = make_route(func)
+            else:
+                rules = [filters] if isinstance(filters, Filter) else list(filters)
+                self.routers.setdefault(update_type, FilterRouter()).register(func, all_of(*rules))
+            return func
+        return wrapper
+
+    def compile(self, bot_username: Optional[str]=None) -> None:
+        for router in self.routers.values():
+            router.compile(bot_username)
+
+    async def handle(self, update: Update, data: Optional[dict]=None) -> bool:
+        router = self.routers.get(update.type)
+        route = router.resolve(update.event) if router is not None else None
+        if route is None:
+            route = self.defaults.get(update.type)
+        if route is None:
+            return False
+        if update.type in MESSAGE_UPDATE_TYPES:
+            event = MessageObject.from_dict(update.event, token=self.__token, client=self.__client)
+        else:
+            event = TelegramObject(update.event)
+        await self.invoke(route.handler, event, data=data)
+        return True
+
 class Bot:
-    def __init__(self, TOKEN: str):
+    def __init__(self, TOKEN: str, concurrency: int=100, connection_limit: int=100, keepalive_timeout: float=30.0,
+                 dns_cache_ttl: int=300, ssl_context: Optional[ssl.SSLContext]=None, rate_limit: bool=True,
+                 rate_limiter: Optional[RateLimiter]=None, retry_policy: Optional[RetryPolicy]=None,
+                 json_loads: JsonLoads=json_loads, json_dumps: JsonDumps=json_dumps, storage: Optional[BaseStorage]=None,
+                 file_cache: Optional[FileIdCache]=None):
         self.__token = TOKEN
-        self.__url = f"https://api.telegram.org/bot{self.__token}/"
-        self.__message_handler = CommandHandler(token=self.__token)
-        self.__callback_handler = CallbackDataHandler(token=self.__token)
-        self.__chat_member_handler = ChatMemberHandler(token=self.__token)
-        self.__my_chat_member_handler = MyChatMemberHandler(token=self.__token)
+        if rate_limit and rate_limiter is None:
+            rate_limiter = RateLimiter()
+        # Один пул соединений и один ограничитель частоты на бота и на все объекты апдейтов
+        self.client = TelegramClient(self.__token, ssl_context=ssl_context, connection_limit=connection_limit,
+                                     keepalive_timeout=keepalive_timeout, dns_cache_ttl=dns_cache_ttl,
+                                     rate_limiter=rate_limiter if rate_limit else None, retry_policy=retry_policy,
+                                     json_loads=json_loads, json_dumps=json_dumps, file_cache=file_cache)
+        self.__message_handler = CommandHandler(token=self.__token, client=self.client)
+        self.__callback_handler = CallbackDataHandler(token=self.__token, client=self.client)
+        self.__chat_member_handler = ChatMemberHandler(token=self.__token, client=self.client)
+        self.__my_chat_member_handler = MyChatMemberHandler(token=self.__token, client=self.client)
+        self.__update_handler = UpdateHandler(token=self.__token, client=self.client)
+        self.__outer_middlewares = MiddlewareManager("outer")
+        self.__inner_middlewares = MiddlewareManager("inner")
+        self.__process = None  # Скомпилированный путь обработки апдейта, собирается в compile_handlers
+        self.storage = storage  # Хранилище состояний FSM; хендлеры получают FSMContext параметром `*, state`
+        self.__fsm = FSMMiddleware(storage) if storage is not None else None
         self.update_offset = 0
-        self.session = None
-        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
+        self.me: Optional[GetMe] = None  # Кэш getMe, заполняется в run()
+        self.dispatcher = Dispatcher(self.process_update, concurrency=concurrency)
     
-    def message_handler(self, command: str = None, commands: List[str] = None, prefix: str = None):
-        return self.__message_handler.command(command, commands, prefix)
+    def message_handler(self, command: str = None, commands: List[str] = None, prefix: str = None, filters=None):
+        return self.__message_handler.command(command, commands, prefix, filters)
+
+    def compile_handlers(self, bot_username: Optional[str]=None) -> None:
+        """Собирает таблицы команд и фильтров и цепочки мидлварей; вызывается при запуске, после getMe."""
+        self.__message_handler.router.compile(bot_username)
+        self.__message_handler.filters.compile(bot_username)
+        self.__callback_handler.filters.compile(bot_username)
+        self.__update_handler.compile(bot_username)
+        # Без мидлварей цепочки вырождаются в прямые вызовы
+        route = self.__route_update
+        if self.__fsm is not None:
+            # FSM - самая внутренняя из внешних мидлварей: состояние читается только для апдейтов,
+            # которые пропустили антифлуд и пользовательские мидлвари
+            route = partial(self.__fsm, route)
+        self.__process = self.__outer_middlewares.compile(route)
+        invoke = make_invoke(self.__inner_middlewares.compile(_call_handler_from_chain)) if len(self.__inner_middlewares) else call_handler
+        for handler in (self.__message_handler, self.__callback_handler, self.__chat_member_handler,
+                        self.__my_chat_member_handler, self.__update_handler):
+            handler.invoke = invoke
 
-    def callback_handler(self, command: str = None):
-        return self.__callback_handler.callback(command)
+    def callback_handler(self, command: Union[str, CallbackData, CallbackDataQuery] = None, filters=None):
+        return self.__callback_handler.callback(command, filters)
     
+    def update_handler(self, update_type: str, filters=None):
+        """Хендлер для апдейтов типа `update_type` ("edited_message", "inline_query", "poll", ...)."""
+        return self.__update_handler.register(update_type, filters)
+
+    def edited_message_handler(self, filters=None):
+        return self.__update_handler.register("edited_message", filters)
+
+    def channel_post_handler(self, filters=None):
+        return self.__update_handler.register("channel_post", filters)
+
+    def inline_query_handler(self, filters=None):
+        return self.__update_handler.register("inline_query", filters)
+
+    def chat_join_request_handler(self, filters=None):
+        return self.__update_handler.register("chat_join_request", filters)
+
+    def get_allowed_updates(self) -> List[str]:
+        """Типы апдейтов, для которых зарегистрированы хендлеры - остальные Telegram присылать не будет."""
+        used = self.__update_handler.update_types
+        if (self.__message_handler.registered or self.__chat_member_handler.handlers
+                or self.__my_chat_member_handler.handlers):
+            used.add("message")
+        if self.__callback_handler.registered:
+            used.add("callback_query")
+        return [update_type for update_type in UPDATE_TYPES if update_type in used]
+
+    def outer_middleware(self, middleware: Middleware) -> Middleware:
+        """
+        Мидлварь на весь апдейт (событие - словарь апдейта): выполняется до роутинга,
+        в том числе для апдейтов, которые не дойдут ни до одного хендлера.
+        """
+        self.__process = None
+        return self.__outer_middlewares.register(middleware)
+
+    def throttle(self, rate: int=5, period: float=1.0, action: str="drop", key="user", **kwargs) -> ThrottlingMiddleware:
+        """
+        Включает антифлуд: не больше `rate` апдейтов за `period` секунд от одного пользователя.
+        `action` - "drop", "warn" (одно предупреждение на серию) или "delay".
+        """
+        return self.outer_middleware(ThrottlingMiddleware(rate, period, action, key, client=self.client, **kwargs))
+
+    def middleware(self, middleware: Middleware) -> Middleware:
+        """Мидлварь вокруг вызова хендлера (событие - объект, который получит хендлер)."""
+        self.__process = None
+        return self.__inner_middlewares.register(middleware)
+
     def chat_member(self, indicator: int):
         return self.__chat_member_handler.chat_member(indicator)
     
     def my_chat_member(self, indicator: int):
         return self.__my_chat_member_handler.my_chat_member(indicator)
 
+    @property
+    def ssl_context(self) -> ssl.SSLContext:
+        return self.client.ssl_context
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        return self.client.rate_limiter
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        return self.client.session
+
     async def start_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=self.ssl_context))
+        await self.client.start_session()
 
     async def close_session(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
+        await self.client.close_session()
+
+    async def close_storage(self) -> None:
+        """Закрывает хранилище состояний FSM и кэш file_id."""
+        if self.storage is not None:
+            await self.storage.close()
+        if self.client.file_cache is not None:
+            await self.client.file_cache.close()
 
     async def send_message(self, chat_id: int, message: str, reply_to_message_id: int=None, parse_mode: str="HTML", reply_markup=None) -> MessageObject:
         if not isinstance(parse_mode, str):
@@ -272,64 +480,47 @@ class Bot:
         if reply_to_message_id:
             payload["reply_to_message_id"] = reply_to_message_id
 
-        try:
-            async with self.session.post(self.__url + "sendMessage", json=payload) as response:
-                response.raise_for_status()  # Бросает исключение для HTTP-ошибок
-                data = (await response.json()).get("result")
-                loggers.event.info("The message has been sent successfully.")
-                data_from = data.get("from")
-                data_chat = data.get("chat")
-                return MessageObject(message_id=int(data.get("message_id")), fullname=data_from.get("fullname"), username=data_from.get("username"),
-                                     is_bot=data_from.get("is_bot"), message_text=data.get("text"), user_id=data_from.get("id"),
-                                     chat_id=data_chat.get("id"), type_chat=data_chat.get("type"), title=data_chat.get("title", None), chat_username=data_chat.get("username", None), token=self.__token)
-        except Exception as e:
-            raise ValidationError(f"{e}")
+        result = await self.client.call("sendMessage", payload)
+        loggers.event.info("The message has been sent successfully.")
+        return MessageObject.from_result(result, token=self.__token, client=self.client)
     
-    async def send_photo(self, chat_id: int, file_path: str=None, url_photo: str=None, message_id: int=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
+    async def broadcast(self, chat_ids: Recipients, message: str, parse_mode: str="HTML", reply_markup=None,
+                        rate: float=25.0, concurrency: int=20, checkpoint: Optional[str]=None,
+                        blocked_file: Optional[str]=None, max_retries: int=3) -> BroadcastStats:
+        """
+        Рассылает сообщение получателям из списка или асинхронного итератора не чаще
+        `rate` сообщений в секунду. На 429 откладывается только получивший его чат;
+        с `checkpoint` прерванная рассылка продолжается с места остановки (см. Broadcast).
+        """
+        if not isinstance(message, str):
+            raise ValidationError(f"Expected 'message' to be a string, got {type(message).__name__}")
+        payload = {"text": message, "parse_mode": parse_mode}
+        if reply_markup:
+            payload["reply_markup"] = reply_markup
+
+        async def send(chat_id: int) -> None:
+            # 429 не ждём в клиенте - чат откладывает сама рассылка, не занимая воркер
+            await self.client.call("sendMessage", {**payload, "chat_id": chat_id}, wait_retry_after=False)
+
+        engine = Broadcast(send, rate=rate, concurrency=concurrency, max_retries=max_retries,
+                           checkpoint=checkpoint, blocked_file=blocked_file)
+        return await engine.run(chat_ids)
+
+    async def send_photo(self, chat_id: int, file_path: Union[Source, InputFile]=None, url_photo: str=None, message_id: int=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
             raise ValidationError("The 'parse_mode' parameter cannot be None or not a string.")
         
-        if not isinstance(url_photo, str):
+        if file_path is None and not isinstance(url_photo, str):
             raise ValidationError("The 'url_photo' parameter cannot be None or not a string.")
         await self.start_session()
         
-        try:
-            if file_path:
-                # Чтение файла и создание FormData
-                with open(file_path, "rb") as photo_file:
-                    form_data = aiohttp.FormData()
-                    form_data.add_field("chat_id", str(chat_id))
-                    form_data.add_field("photo", photo_file, filename=file_path.split("/")[-1])
-                    form_data.add_field("parse_mode", parse_mode)
-            else:
-                form_data = aiohttp.FormData()
-                form_data.add_field("chat_id", str(chat_id))
-                form_data.add_field("photo", url_photo)
-                form_data.add_field("parse_mode", parse_mode)
-            if caption:
-                form_data.add_field("caption", caption)
-
-            if reply_markup:
-                form_data.add_field("reply_markup", reply_markup)
-            
-            if message_id:
-                form_data.add_field("reply_to_message_id", message_id)
-                
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}sendPhoto", data=form_data) as response:
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.event.info("The photo was successfully sent.")
-                data = await response.json()
-                return True
-        
-        except aiohttp.ClientError as e:
-            loggers.event.error(f"ERROR: {e}")
-            return False
-        
-        except FileNotFoundError:
-            error_message = f"File not found: {file_path}"
-            loggers.event.error(error_message)
-            return False
+        return await send_photo(self.client, file_path, url_photo, {
+            "chat_id": chat_id,
+            "parse_mode": parse_mode,
+            "caption": caption or None,
+            "reply_markup": reply_markup or None,
+            "reply_to_message_id": message_id or None,
+        })
     
     async def set_bot_name(self, name: Optional[str]=None, language_code: Optional[str]=None):
         if name == None:
@@ -343,17 +534,15 @@ class Bot:
             payload["language_code"] = language_code
 
         try:
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}setMyName", json=payload) as response:
-                if not (await response.json()).get("ok"):
-                    loggers.bot.error(f"{(await response.json()).get("description")}")
-                    return False
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.bot.info("The bot's name has been successfully changed to %s", name)
-                data = await response.json()
-                return True
-        except Exception as e:
+            await self.client.call("setMyName", payload)
+        except TelegramBadRequest as e:
+            loggers.bot.error(f"{e}")
+            return False
+        except TelegramNetworkError as e:
             raise TelegramBadRequest(f"{e}")
+        loggers.bot.info("The bot's name has been successfully changed to %s", name)
+        self.me = None  # Имя изменилось - при следующем get_me кэш будет обновлён
+        return True
     
     async def get_chat(self, chat_id: int):
         if not isinstance(chat_id, int):
@@ -365,53 +554,134 @@ class Bot:
             payload = {
                 "chat_id": chat_id
             }
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}getChat", json=payload) as response:
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.bot.info("The message has been sent successfully.")
-                data = await response.json()
-                return GetChat(data.get("result"))
-        except aiohttp.ClientError as e:
+            return GetChat(await self.client.call("getChat", payload))
+        except TelegramNetworkError as e:
             loggers.bot.error(f"ERROR: {e}")
             return {"ok": False, "error": str(e)}
     
-    async def get_updates(self):
-        await self.start_session()
-        async with self.session.get(self.__url + "getUpdates", params={"offset": self.update_offset}) as response:
-            if response.status == 200:
-                data = await response.json()
-                for update in data.get("result", []):
-                    if update.get("callback_query", None) != None:
-                        self.update_offset = update["update_id"] + 1
-                        loggers.event.info("Update has been successfully handled.")
-                        await self.__callback_handler.handle(update, self)
-                        break
-                    if update.get("message", {}).get("new_chat_members", None) != None:
-                        self.update_offset = update["update_id"] + 1
-                        loggers.event.info("Update has been successfully handled.")
-                        await self.__chat_member_handler.handle(update, JOIN_TRANSITION, bot_id=(await self.get_me()).id)
-                        await self.__my_chat_member_handler.handle(update, JOIN_TRANSITION, bot_id=(await self.get_me()).id)
-                        break
-                    if update.get("message", {}).get("left_chat_member", None) != None:
-                        self.update_offset = update["update_id"] + 1
-                        loggers.event.info("Update has been successfully handled.")
-                        await self.__chat_member_handler.handle(update, LEAVE_TRANSITION, bot_id=(await self.get_me()).id)
-                        break
-                    if update.get("message", {}).get("text", None) != None:
-                        self.update_offset = update["update_id"] + 1
-                        loggers.event.info("Update has been successfully handled.")
-                        await self.__message_handler.handle(update, self)
-                        break
-                    self.update_offset = update["update_id"] + 1
-
-    async def get_me(self):
+    async def process_update(self, update: dict) -> None:
+        if self.__process is None:
+            self.compile_handlers(self.me.username if self.me else None)
+        try:
+            await self.__process(update, {})
+        finally:
+            # Хендлер отработал - ответ на вебхук больше не ждёт вызова из хендлера
+            reply = current_webhook_reply.get()
+            if reply is not None:
+                reply.close()
+
+    async def __route_update(self, update: dict, data: dict) -> None:
+        event = Update(update)
+        if event.type == "callback_query":
+            await self.__callback_handler.handle(update, self, data=data)
+        elif event.type == "message":
+            message = event.event
+            if message.get("new_chat_members", None) != None:
+                bot_id = (await self.get_me()).id
+                await self.__chat_member_handler.handle(update, JOIN_TRANSITION, bot_id=bot_id, data=data)
+                await self.__my_chat_member_handler.handle(update, JOIN_TRANSITION, bot_id=bot_id, data=data)
+            elif message.get("left_chat_member", None) != None:
+                await self.__chat_member_handler.handle(update, LEAVE_TRANSITION, bot_id=(await self.get_me()).id, data=data)
+            elif message.get("text", None) != None or len(self.__message_handler.filters):
+                await self.__message_handler.handle(update, self, data=data)
+            else:
+                return
+        elif not await self.__update_handler.handle(event, data=data):
+            return
+        loggers.event.info("Update has been successfully handled.")
+
+    async def get_updates(self, timeout: int=0, limit: int=100, allowed_updates: Optional[List[str]]=None) -> bool:
+        if not isinstance(timeout, int) or timeout < 0:
+            raise ValidationError(f"Expected 'timeout' to be a non-negative integer, got {timeout!r}")
+        if not isinstance(limit, int) or not 1 <= limit <= 100:
+            raise ValidationError(f"Expected 'limit' to be an integer between 1 and 100, got {limit!r}")
         await self.start_session()
-        async with self.session.get(self.__url + "getMe") as response:
-            if response.status == 200:
-                data = await response.json()
-                return GetMe(data.get("result"))
+        
+        params = {
+            "offset": self.update_offset,
+            "timeout": timeout,
+            "limit": limit
+        }
+        if allowed_updates is not None:
+            params["allowed_updates"] = self.client.json_dumps(allowed_updates)
+        
+        # Telegram держит соединение до `timeout` секунд, поэтому клиентский таймаут должен быть больше
+        request_timeout = aiohttp.ClientTimeout(total=timeout + 10)
+        try:
+            updates = await self.client.call("getUpdates", http_method="GET", params=params, timeout=request_timeout)
+        except TelegramUnauthorizedError:
+            raise
+        except (TelegramAPIError, TelegramNetworkError) as e:
+            loggers.bot.error(f"getUpdates failed: {e}")
+            return False
+        
+        if updates:
+            # Смещение фиксируется один раз на весь пакет
+            self.update_offset = updates[-1]["update_id"] + 1
+        for update in updates:
+            if self.dispatcher.running:
+                await self.dispatcher.feed(update)
             else:
-                raise ValidationError((await response.json()).get("description"))
+                await self.process_update(update)
+        return True
+
+    @property
+    def id(self) -> Optional[int]:
+        return self.me.id if self.me else None
+
+    async def get_me(self, refresh: bool=False) -> GetMe:
+        """
+        Возвращает закэшированный getMe. Запрос к Telegram выполняется только
+        при первом вызове или с `refresh=True`.
+        """
+        if self.me is not None and not refresh:
+            return self.me
+        self.me = GetMe(await self.client.call("getMe", http_method="GET"))
+        return self.me
+
+    async def send_media_group(self, chat_id: int, media: List[Union[InputMedia, Source, InputFile]], message_id: int=None,
+                               upload_chat_id: Optional[int]=None) -> List[MessageObject]:
+        """
+        Отправляет альбом из 2-10 фото, видео, аудио или документов одним сообщением.
+        Элементы - InputMedia или локальные файлы (они отправляются как фото).
+        С `upload_chat_id` файлы сначала параллельно загружаются в этот чат ради file_id.
+        """
+        result = await send_media_group(self.client, chat_id, media, reply_to_message_id=message_id, upload_chat_id=upload_chat_id)
+        return [MessageObject.from_result(message, token=self.__token, client=self.client) for message in result]
+
+    async def get_file(self, file_id: str) -> File:
+        if not isinstance(file_id, str):
+            raise ValidationError(f"Expected 'file_id' to be a string, got {type(file_id).__name__}")
+        return File(await self.client.call("getFile", {"file_id": file_id}))
+
+    async def __file_path(self, file: Union[str, File, TelegramObject]) -> str:
+        # Принимается file_id, ответ getFile или любой объект с file_id (фото, документ, ...)
+        if isinstance(file, File) and file.file_path:
+            return file.file_path
+        file_id = file if isinstance(file, str) else getattr(file, "file_id", None)
+        file_path = (await self.get_file(file_id)).file_path
+        if not file_path:
+            raise TelegramBadRequest(f"File {file_id} is not available for download")
+        return file_path
+
+    async def iter_file(self, file: Union[str, File, TelegramObject], chunk_size: int=64 * 1024, offset: int=0):
+        """Асинхронный генератор кусков файла, начиная с `offset` байта."""
+        file_path = await self.__file_path(file)
+        async for chunk in self.client.stream_file(file_path, chunk_size=chunk_size, offset=offset):
+            yield chunk
+
+    async def download(self, file: Union[str, File, TelegramObject], destination: Destination, chunk_size: int=64 * 1024,
+                       resume: bool=False, checksum: Optional[str]=None) -> Downloaded:
+        """
+        Скачивает файл в путь или бинарный файл потоком, по `chunk_size` байт.
+        `resume=True` докачивает недокачанный файл по пути через Range,
+        `checksum` ("sha256", "md5", ...) считает хэш файла во время скачивания.
+        """
+        file_path = await self.__file_path(file)
+        result = await save_stream(lambda offset: self.client.stream_file(file_path, chunk_size=chunk_size, offset=offset),
+                                   destination, chunk_size=chunk_size, resume=resume, checksum=checksum)
+        loggers.event.info("The file %s was downloaded (%d bytes).", file_path, result.size)
+        return result
     
     async def edit_text(self, chat_id: int, message_id: int, text: str) -> MessageObject:
         if not isinstance(chat_id, int):
@@ -430,16 +700,8 @@ class Bot:
             "text": text
         }
         
-        async with self.session.post(self.__url + "editMessageText", json=payload) as response:
-            if response.status == 200:
-                data = (await response.json()).get("result")
-                data_from = data.get("from")
-                data_chat = data.get("chat")
-                return MessageObject(message_id=int(data.get("message_id")), fullname=data_from.get("fullname"), username=data_from.get("username"),
-                                     is_bot=data_from.get("is_bot"), message_text=data.get("text"), user_id=data_from.get("id"),
-                                     chat_id=data_chat.get("id"), type_chat=data_chat.get("type"), title=data_chat.get("title", None), chat_username=data_chat.get("username", None), token=self.__token)
-            else:
-                raise TelegramBadRequest((await response.json()).get("description"))
+        result = await self.client.call("editMessageText", payload)
+        return MessageObject.from_result(result, token=self.__token, client=self.client)
     
     async def delete_message(self, chat_id: int, message_id: int) -> bool:
         if not isinstance(chat_id, int):
@@ -454,37 +716,138 @@ class Bot:
             "message_id": message_id,
         }
         
-        async with self.session.post(self.__url + "deleteMessage", json=payload) as response:
-            if response.status == 200:
-                data = await response.json()
-                return True
-            else:
-                raise TelegramBadRequest((await response.json()).get("description"))
+        await self.client.call("deleteMessage", payload)
+        return True
     
     async def delete_webhook(self, drop_pending_updates: bool=False) ->  bool:
         if not isinstance(drop_pending_updates, bool):
             raise ValidationError(f"Expected 'drop_pending_updates' to be a boolean, got {type(drop_pending_updates).__name__}")
         await self.start_session()
         payload = {
-            "drop_pending_updates": str(drop_pending_updates).lower()
+            "drop_pending_updates": drop_pending_updates
         }
         
-        url = f"{self.__url}deleteWebhook"
-        async with self.session.post(url, params=payload) as response:
-            if response.status == 200:
-                data = await response.json()
-                return True
-            else:
-                return False
+        try:
+            await self.client.call("deleteWebhook", payload)
+            return True
+        except TelegramAPIError:
+            return False
+    
+    async def set_webhook(self, url: str, secret_token: Optional[str]=None, drop_pending_updates: bool=False,
+                          allowed_updates: Optional[List[str]]=None, max_connections: Optional[int]=None) -> bool:
+        if not isinstance(url, str) or not url:
+            raise ValidationError(f"Expected 'url' to be a non-empty string, got {url!r}")
+        if not isinstance(drop_pending_updates, bool):
+            raise ValidationError(f"Expected 'drop_pending_updates' to be a boolean, got {type(drop_pending_updates).__name__}")
+        await self.start_session()
+        payload = {
+            "url": url,
+            "drop_pending_updates": drop_pending_updates
+        }
+        if secret_token:
+            payload["secret_token"] = secret_token
+        if allowed_updates is not None:
+            payload["allowed_updates"] = allowed_updates
+        if max_connections:
+            payload["max_connections"] = max_connections
+        
+        await self.client.call("setWebhook", payload)
+        loggers.webhook.info("Webhook has been set to %s", url)
+        return True
+
+    def webhook_app(self, path: str="/webhook", secret_token: Optional[str]=None,
+                    reply_timeout: Optional[float]=None) -> aiohttp.web.Application:
+        """
+        aiohttp-приложение, принимающее апдейты от Telegram. Его можно запустить
+        через run_webhook или встроить в своё приложение.
+
+        С `reply_timeout` ответ на вебхук ждёт хендлер до указанного числа секунд:
+        если хендлер вернул вызов API (`return msg.answer(...)`), он отправляется
+        в теле ответа без отдельного запроса. Не успел - вызов уйдёт обычным запросом.
+        """
+        async def handle(request: aiohttp.web.Request) -> aiohttp.web.Response:
+            # Telegram присылает секрет в заголовке - сравниваем за постоянное время
+            if secret_token is not None and not hmac.compare_digest(
+                request.headers.get("X-Telegram-Bot-Api-Secret-Token", "").encode(), secret_token.encode()
+            ):
+                loggers.webhook.warning("Rejected webhook request with a wrong secret token")
+                return aiohttp.web.Response(status=401)
+            try:
+                update = await request.json(loads=self.client.json_loads)
+            except ValueError:
+                return aiohttp.web.Response(status=400)
+            if not isinstance(update, dict):
+                return aiohttp.web.Response(status=400)
+            if reply_timeout is None:
+                # Отвечаем сразу, обработка идёт в пуле диспетчера
+                await self.dispatcher.feed(update)
+                return aiohttp.web.Response()
+            reply = WebhookReply()
+            context = contextvars.copy_context()
+            context.run(current_webhook_reply.set, reply)
+            await self.dispatcher.feed(update, context=context)
+            method = await reply.wait(reply_timeout)
+            if method is None:
+                return aiohttp.web.Response()
+            return aiohttp.web.json_response(method, dumps=self.client.json_dumps)
+
+        async def on_startup(app: aiohttp.web.Application) -> None:
+            self.compile_handlers((await self.get_me(refresh=True)).username)
+            self.dispatcher.start()
+
+        async def on_cleanup(app: aiohttp.web.Application) -> None:
+            await self.dispatcher.close()
+            await self.close_storage()
+            await self.close_session()
+
+        app = aiohttp.web.Application()
+        app.router.add_post(path, handle)
+        app.on_startup.append(on_startup)
+        app.on_cleanup.append(on_cleanup)
+        return app
+
+    async def run_webhook(self, host: str="0.0.0.0", port: int=8080, path: str="/webhook", secret_token: Optional[str]=None,
+                          webhook_url: Optional[str]=None, allowed_updates: Optional[List[str]]=None,
+                          reply_timeout: Optional[float]=None) -> None:
+        """
+        Запускает веб-сервер для приёма апдейтов. Если передан `webhook_url`,
+        вебхук регистрируется в Telegram перед стартом. Без `allowed_updates`
+        Telegram присылает только типы апдейтов, для которых есть хендлеры.
+        """
+        runner = aiohttp.web.AppRunner(self.webhook_app(path=path, secret_token=secret_token, reply_timeout=reply_timeout))
+        await runner.setup()
+        try:
+            if webhook_url:
+                if allowed_updates is None:
+                    allowed_updates = self.get_allowed_updates() or None
+                await self.set_webhook(webhook_url, secret_token=secret_token, allowed_updates=allowed_updates)
+            site = aiohttp.web.TCPSite(runner, host, port)
+            await site.start()
+            loggers.webhook.info(f"Webhook server started on {host}:{port}{path}")
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loggers.webhook.info("Webhook server stopped")
+            await runner.cleanup()
 
-    async def run(self) -> None:
+    async def run(self, timeout: int=30, limit: int=100, allowed_updates: Optional[List[str]]=None) -> None:
+        """
+        Long polling: Telegram держит запрос открытым до `timeout` секунд,
+        поэтому следующий getUpdates отправляется сразу после ответа.
+        Без `allowed_updates` запрашиваются только типы апдейтов, для которых есть хендлеры.
+        """
         try:
-            bot = await self.get_me()
+            bot = await self.get_me(refresh=True)
+            self.compile_handlers(bot.username)
+            if allowed_updates is None:
+                allowed_updates = self.get_allowed_updates() or None
             loggers.bot.info("Poll started")
             loggers.bot.info(f"Bot with the name '{bot.first_name}' and the username @{bot.username} has been launched")
+            self.dispatcher.start()
             while True:
-                await self.get_updates()
-                await asyncio.sleep(1)
+                if not await self.get_updates(timeout=timeout, limit=limit, allowed_updates=allowed_updates):
+                    await asyncio.sleep(1)
         except asyncio.CancelledError:
             pass
         except Exception:
@@ -493,4 +856,6 @@ class Bot:
         #     loggers.bot.error(f"Couldn't connect to telegram bot\nCheck your internet connection if it doesn't help, check bot's token for correctness.")
         finally:
             loggers.bot.info(f"Poll stopped")
+            await self.dispatcher.close()
+            await self.close_storage()
             await self.close_session()
@@ -0,0 +1,222 @@
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from . import loggers
+from .exceptions import AioTeleError, TelegramForbiddenError, TelegramRetryAfter, ValidationError
+from .ratelimit import TokenBucket
+
+Recipients = Union[Iterable[int], AsyncIterable[int]]
+
+
+class BroadcastStats:
+    """Итоги рассылки; при возобновлении из чекпоинта счётчики продолжаются."""
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.blocked = 0  # Пользователь заблокировал бота, удалён или бота исключили из чата
+        self.retried = 0  # Повторы после 429
+        self.errors: Counter = Counter()  # {тип ошибки: количество}
+        self.elapsed = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.sent + self.failed + self.blocked
+
+    @property
+    def throughput(self) -> float:
+        """Отправлено сообщений в секунду."""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"sent": self.sent, "failed": self.failed, "blocked": self.blocked, "retried": self.retried,
+                "errors": dict(self.errors), "elapsed": self.elapsed}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BroadcastStats":
+        stats = cls()
+        for name in ("sent", "failed", "blocked", "retried", "elapsed"):
+            setattr(stats, name, data.get(name, 0))
+        stats.errors.update(data.get("errors", {}))
+        return stats
+
+    def __repr__(self) -> str:
+        return (f"BroadcastStats(sent={self.sent}, failed={self.failed}, blocked={self.blocked}, "
+                f"retried={self.retried}, throughput={self.throughput:.1f}/s)")
+
+
+class Broadcast:
+    """
+    Массовая рассылка: `send(chat_id)` вызывается для каждого получателя не чаще
+    `rate` раз в секунду, одновременно - не больше `concurrency` вызовов.
+
+    Получатели читаются из (асинхронного) итерируемого объекта по мере отправки,
+    поэтому список не загружается в память целиком. На 429 чат откладывается на
+    `retry_after` секунд (до `max_retries` раз), остальные получатели продолжают
+    получать сообщения. Заблокировавшие бота пользователи дописываются в `blocked_file`.
+
+    С `checkpoint` прогресс периодически сохраняется в JSON: повторный запуск с тем же
+    порядком получателей продолжит с места остановки. Гарантия - "хотя бы один раз":
+    сообщения, отправленные после последнего сохранения, могут уйти повторно.
+    Завершённая рассылка помечается в чекпоинте и повторно не запускается.
+    """
+
+    def __init__(self, send: Callable[[int], Awaitable[Any]], rate: float = 25.0, concurrency: int = 20,
+                 max_retries: int = 3, checkpoint: Optional[str] = None, blocked_file: Optional[str] = None,
+                 checkpoint_interval: float = 5.0):
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise ValidationError(f"Expected 'concurrency' to be a positive integer, got {concurrency!r}")
+        self.send = send
+        self.bucket = TokenBucket(rate, capacity=1.0)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.checkpoint = checkpoint
+        self.blocked_file = blocked_file
+        self.checkpoint_interval = checkpoint_interval
+        self.stats = BroadcastStats()
+
+        self.__queue: Optional[asyncio.Queue] = None
+        self.__pending = 0  # Получатели, взятые из источника и ещё не обработанные окончательно
+        self.__finished: Optional[asyncio.Event] = None
+        self.__position = 0  # Все получатели до этого номера обработаны
+        self.__done: Set[int] = set()  # Обработанные номера после `__position`
+        self.__blocked: List[int] = []  # Ещё не записанные в blocked_file
+        self.__retries: Set[asyncio.Task] = set()
+        self.__exhausted = False  # Источник получателей прочитан до конца
+        self.__elapsed = 0.0  # Время работы до возобновления из чекпоинта
+
+    def __load_checkpoint(self) -> Optional[dict]:
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return None
+        with open(self.checkpoint, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def __write_checkpoint(self, state: dict, blocked: List[int]) -> None:
+        if blocked and self.blocked_file:
+            with open(self.blocked_file, "a", encoding="utf-8") as file:
+                file.write("".join(f"{chat_id}\n" for chat_id in blocked))
+        if self.checkpoint:
+            temp = self.checkpoint + ".tmp"
+            with open(temp, "w", encoding="utf-8") as file:
+                json.dump(state, file)
+            os.replace(temp, self.checkpoint)  # Атомарно: прерванная запись не портит чекпоинт
+
+    async def __save(self, started: float, done: bool = False) -> None:
+        self.stats.elapsed = self.__elapsed + (time.monotonic() - started)
+        blocked, self.__blocked = self.__blocked, []
+        # Номера, обработанные не по порядку, тоже сохраняются - иначе при возобновлении они уйдут повторно
+        state = {"position": self.__position, "processed": sorted(self.__done), "done": done,
+                 "stats": self.stats.to_dict()}
+        await asyncio.to_thread(self.__write_checkpoint, state, blocked)
+
+    def __complete(self, number: int) -> None:
+        self.__done.add(number)
+        while self.__position in self.__done:
+            self.__done.remove(self.__position)
+            self.__position += 1
+        self.__pending -= 1
+        if self.__pending == 0 and self.__exhausted:
+            self.__finished.set()
+
+    async def __retry_later(self, item: Tuple[int, int, int], delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.__queue.put(item)
+
+    async def __deliver(self, number: int, chat_id: int, attempt: int) -> None:
+        try:
+            await self.send(chat_id)
+        except TelegramRetryAfter as e:
+            if attempt < self.max_retries:
+                # Откладываем только этот чат, воркер сразу берёт следующего получателя
+                self.stats.retried += 1
+                task = asyncio.create_task(self.__retry_later((number, chat_id, attempt + 1), float(e.retry_after)))
+                self.__retries.add(task)
+                task.add_done_callback(self.__retries.discard)
+                return
+            self.stats.failed += 1
+            self.stats.errors[type(e).__name__] += 1
+        except TelegramForbiddenError:
+            self.stats.blocked += 1
+            self.__blocked.append(chat_id)
+        except AioTeleError as e:
+            self.stats.failed += 1
+            self.stats.errors[type(e).__name__] += 1
+            loggers.bot.debug("Broadcast to %s failed: %s", chat_id, e)
+        except Exception as e:
+            # Ошибка в самом send не должна останавливать рассылку
+            self.stats.failed += 1
+            self.stats.errors[type(e).__name__] += 1
+            loggers.bot.exception("Broadcast to %s failed", chat_id)
+        else:
+            self.stats.sent += 1
+        self.__complete(number)
+
+    async def __worker(self) -> None:
+        while True:
+            number, chat_id, attempt = await self.__queue.get()
+            await self.bucket.acquire()
+            await self.__deliver(number, chat_id, attempt)
+
+    async def __produce(self, recipients: Recipients, skip: int, processed: Set[int]) -> None:
+        # `processed` - копия номеров из чекпоинта: `__done` очищается по мере продвижения `__position`
+        number = 0
+        if hasattr(recipients, "__aiter__"):
+            async for chat_id in recipients:
+                if number >= skip and number not in processed:
+                    self.__pending += 1
+                    await self.__queue.put((number, chat_id, 0))
+                number += 1
+        else:
+            for chat_id in recipients:
+                if number >= skip and number not in processed:
+                    self.__pending += 1
+                    await self.__queue.put((number, chat_id, 0))
+                number += 1
+        self.__exhausted = True
+        if self.__pending == 0:
+            self.__finished.set()
+
+    async def run(self, recipients: Recipients) -> BroadcastStats:
+        state = await asyncio.to_thread(self.__load_checkpoint)
+        if state is not None:
+            self.stats = BroadcastStats.from_dict(state.get("stats", {}))
+            if state.get("done"):
+                loggers.bot.info("Broadcast %s is already finished: %r", self.checkpoint, self.stats)
+                return self.stats
+            loggers.bot.info("Resuming broadcast from recipient %d", state.get("position", 0))
+        self.__position = state.get("position", 0) if state else 0
+        self.__done = set(state.get("processed", [])) if state else set()
+        self.__elapsed = self.stats.elapsed
+        self.__queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        self.__finished = asyncio.Event()
+        started = time.monotonic()
+
+        workers = [asyncio.create_task(self.__worker()) for _ in range(self.concurrency)]
+        producer = asyncio.create_task(self.__produce(recipients, self.__position, set(self.__done)))
+        finished = asyncio.create_task(self.__finished.wait())
+        try:
+            waiting = {finished, producer}
+            while not finished.done():
+                done, _ = await asyncio.wait(waiting, timeout=self.checkpoint_interval, return_when=asyncio.FIRST_COMPLETED)
+                if producer in done:
+                    producer.result()  # Ошибка источника получателей прерывает рассылку
+                    waiting.discard(producer)
+                if not done:
+                    await self.__save(started)
+                    loggers.bot.info("Broadcast progress: %r", self.stats)
+            await self.__save(started, done=True)
+            loggers.bot.info("Broadcast finished: %r", self.stats)
+            return self.stats
+        finally:
+            tasks = (*workers, producer, finished, *self.__retries)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not self.__finished.is_set():
+                # Прервано - сохраняем, с какого получателя продолжать
+                await self.__save(started)
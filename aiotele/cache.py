@@ -0,0 +1,75 @@
+import time
+from collections import OrderedDict
+
+from typing import Any, Hashable, Iterator, Optional, Tuple
+
+from .exceptions import ValidationError
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Словарь ограниченного размера со сроком жизни записей.
+
+    Записи хранятся в порядке последней записи: при переполнении вытесняется
+    самая старая, просроченные удаляются при обращении и при каждой записи с начала
+    очереди. Память ограничена `maxsize` записями при любом числе ключей.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: Optional[float] = None):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValidationError(f"Expected 'maxsize' to be a positive integer, got {maxsize!r}")
+        if ttl is not None and ttl <= 0:
+            raise ValidationError(f"Expected 'ttl' to be a positive number, got {ttl!r}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.__data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()  # {ключ: (истекает, значение)}
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(list(self.__data))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self.__data.get(key)
+        if item is None:
+            return default
+        expires, value = item
+        if expires and expires <= time.monotonic():
+            del self.__data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self.__data[key] = (time.monotonic() + ttl if ttl else 0.0, value)
+        self.__data.move_to_end(key)
+        self.expire()
+        while len(self.__data) > self.maxsize:
+            self.__data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self.__data.pop(key, None)
+        return default if item is None else item[1]
+
+    def expire(self) -> int:
+        """Удаляет просроченные записи с начала очереди и возвращает их число."""
+        if not self.ttl:
+            return 0
+        now = time.monotonic()
+        removed = 0
+        while self.__data:
+            key, (expires, _) = next(iter(self.__data.items()))
+            if not expires or expires > now:
+                break
+            del self.__data[key]
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        self.__data.clear()
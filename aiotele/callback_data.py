@@ -0,0 +1,103 @@
+from typing import Any, Dict, Optional
+
+from .exceptions import ValidationError
+from .filters.base import Filter
+from .keyboards import InlineButton
+
+MAX_CALLBACK_DATA = 64  # Лимит Telegram на callback_data в байтах
+
+
+class CallbackData:
+    """
+    Схема callback_data: пространство имён и типизированные поля.
+
+        page = CallbackData("page", number=int, query=str)
+        page.new(number=2, query="cats")    # "page:2:cats"
+        page.parse("page:2:cats")           # {"number": 2, "query": "cats"}
+
+    Поддерживаются str, int, float и bool. Разбор - обычный split по разделителю,
+    поэтому значения не могут содержать разделитель.
+    """
+
+    def __init__(self, prefix: str, sep: str = ":", **fields: type):
+        if not prefix or sep in prefix:
+            raise ValidationError(f"Callback data prefix must be a non-empty string without {sep!r}, got {prefix!r}")
+        for name, field_type in fields.items():
+            if field_type not in (str, int, float, bool):
+                raise ValidationError(f"Unsupported type {field_type!r} of callback data field {name!r}")
+        self.prefix = prefix
+        self.sep = sep
+        self.fields = fields
+        self.namespace = prefix + sep if fields else prefix
+
+    def __encode(self, name: str, value: Any) -> str:
+        if value is None:
+            return ""
+        field_type = self.fields[name]
+        if field_type is bool:
+            return "1" if value else "0"
+        if not isinstance(value, field_type) or (field_type is int and isinstance(value, bool)):
+            raise ValidationError(f"Expected callback data field {name!r} to be {field_type.__name__}, got {value!r}")
+        value = str(value)
+        if self.sep in value:
+            raise ValidationError(f"Callback data field {name!r} must not contain {self.sep!r}")
+        return value
+
+    def new(self, **values: Any) -> str:
+        unknown = values.keys() - self.fields.keys()
+        if unknown:
+            raise ValidationError(f"Unknown callback data fields: {', '.join(sorted(unknown))}")
+        parts = [self.prefix]
+        parts.extend(self.__encode(name, values.get(name)) for name in self.fields)
+        data = self.sep.join(parts)
+        if len(data.encode()) > MAX_CALLBACK_DATA:
+            raise ValidationError(f"Callback data {data!r} is longer than {MAX_CALLBACK_DATA} bytes")
+        return data
+
+    def parse(self, data: str) -> Dict[str, Any]:
+        parts = data.split(self.sep)
+        if parts[0] != self.prefix or len(parts) != len(self.fields) + 1:
+            raise ValidationError(f"Callback data {data!r} does not match {self.prefix!r}")
+        result = {}
+        for (name, field_type), value in zip(self.fields.items(), parts[1:]):
+            if value == "" and field_type is not str:
+                result[name] = None
+            elif field_type is bool:
+                result[name] = value == "1"
+            else:
+                try:
+                    result[name] = field_type(value)
+                except ValueError:
+                    raise ValidationError(f"Invalid value {value!r} of callback data field {name!r}")
+        return result
+
+    def button(self, text: str, **values: Any) -> InlineButton:
+        """Inline-кнопка с callback_data по этой схеме, например для MarkupButtonInline.add."""
+        return InlineButton(text, self.new(**values))
+
+    def filter(self, **conditions: Any) -> "CallbackDataQuery":
+        """Фильтр нажатий по схеме; условия сравниваются с разобранными значениями полей."""
+        return CallbackDataQuery(self, conditions)
+
+
+class CallbackDataQuery(Filter):
+    """Нажатие кнопки, чья callback_data разбирается по схеме и совпадает с условиями."""
+
+    cost = 3
+
+    def __init__(self, schema: CallbackData, conditions: Optional[Dict[str, Any]] = None):
+        unknown = (conditions or {}).keys() - schema.fields.keys()
+        if unknown:
+            raise ValidationError(f"Unknown callback data fields: {', '.join(sorted(unknown))}")
+        self.schema = schema
+        self.conditions = conditions or {}
+
+    def check(self, event: dict) -> bool:
+        data = event.get("data")
+        if data is None or not data.startswith(self.schema.namespace):
+            return False
+        try:
+            values = self.schema.parse(data)
+        except ValidationError:
+            return False
+        return all(values[name] == value for name, value in self.conditions.items())
@@ -0,0 +1,368 @@
+import ssl
+import certifi
+import aiohttp
+
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Union
+
+from . import loggers
+from .codecs import JsonDumps, JsonLoads, json_dumps, json_loads
+from .file_cache import FileIdCache, extract_file_id, is_rejected_file_id
+from .input_file import InputFile
+from .exceptions import *
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+
+API_URL = "https://api.telegram.org"
+
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    """Общий TLS-контекст процесса: CA-бандл certifi разбирается один раз, при первом запросе."""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context(cafile=certifi.where())
+    return _ssl_context
+
+
+class WebhookReply:
+    """
+    Слот для одного вызова API, который можно вернуть Telegram прямо в ответе на вебхук.
+
+    Хендлер возвращает неотправленный вызов (например, `return msg.answer("...")`),
+    и пока ответ на вебхук не ушёл, этот вызов записывается в слот вместо HTTP-запроса.
+    После `close()` все вызовы снова уходят обычными запросами.
+    """
+
+    def __init__(self):
+        self.__future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.armed = False
+
+    def capture(self, method: str, payload: dict) -> bool:
+        if not self.armed or self.__future.done():
+            return False
+        self.__future.set_result({"method": method, **payload})
+        return True
+
+    def close(self) -> Optional[dict]:
+        if not self.__future.done():
+            self.__future.set_result(None)
+        return self.__future.result()
+
+    async def wait(self, timeout: float) -> Optional[dict]:
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(asyncio.shield(self.__future), timeout)
+        return self.close()
+
+
+# Слот ответа на текущий вебхук; None при long polling
+current_webhook_reply: ContextVar[Optional[WebhookReply]] = ContextVar("current_webhook_reply", default=None)
+
+
+class _WebhookReplyResponse:
+    """Ответ-заглушка для вызова, отправленного в теле ответа на вебхук."""
+
+    status = 200
+
+    def raise_for_status(self) -> None:
+        pass
+
+    async def json(self) -> dict:
+        return {"ok": True, "result": None}
+
+    async def read(self) -> bytes:
+        return b'{"ok": true, "result": null}'
+
+
+class TelegramClient:
+    """
+    Пул соединений с Bot API.
+
+    Один экземпляр создаётся в Bot и передаётся всем объектам из aiotele.types,
+    поэтому answer/reply/delete_message используют уже открытые соединения.
+    """
+
+    def __init__(self, token: str, ssl_context: Optional[ssl.SSLContext] = None, connection_limit: int = 100,
+                 connection_limit_per_host: int = 0, keepalive_timeout: float = 30.0, dns_cache_ttl: int = 300,
+                 rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None,
+                 json_loads: JsonLoads = json_loads, json_dumps: JsonDumps = json_dumps,
+                 file_cache: Optional[FileIdCache] = None):
+        self.__token = token
+        self.url = f"{API_URL}/bot{self.__token}/"
+        self.file_url = f"{API_URL}/file/bot{self.__token}/"
+        self.__ssl_context = ssl_context
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.json_loads = json_loads
+        self.json_dumps = json_dumps
+        self.file_cache = file_cache
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def ssl_context(self) -> ssl.SSLContext:
+        return self.__ssl_context or get_ssl_context()
+
+    async def start_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=self.ssl_context,
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self.session = aiohttp.ClientSession(connector=connector, json_serialize=self.json_dumps)
+        return self.session
+
+    def form_value(self, value: Any) -> str:
+        """Значение поля multipart-формы: словари и списки (например, reply_markup) сериализуются в JSON."""
+        if isinstance(value, (dict, list)):
+            return self.json_dumps(value)
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return str(value)
+
+    async def multipart(self, fields: Dict[str, Any], files: Dict[str, Any]) -> Union[aiohttp.FormData, Callable[[], aiohttp.FormData]]:
+        """
+        Multipart-тело запроса с файлами. Поля со значением None пропускаются;
+        строка вместо файла (URL или file_id) уходит обычным полем.
+
+        Если все файлы можно прочитать повторно, возвращается фабрика FormData -
+        такой запрос повторяется при ретраях; иначе - готовая FormData.
+        """
+        uploads = {name: InputFile.wrap(value) for name, value in files.items() if not isinstance(value, str)}
+        for file in uploads.values():
+            await file.prepare()
+
+        def build() -> aiohttp.FormData:
+            form = aiohttp.FormData()
+            for name, value in fields.items():
+                if value is not None:
+                    form.add_field(name, self.form_value(value))
+            for name, value in files.items():
+                file = uploads.get(name)
+                if file is None:
+                    form.add_field(name, value)
+                else:
+                    form.add_field(name, file.payload(), filename=file.filename, content_type=file.content_type)
+            return form
+
+        if all(file.replayable for file in uploads.values()):
+            return build
+        return build()
+
+    async def send_file(self, method: str, field: str, file: Any, fields: Dict[str, Any],
+                        chat_id: Optional[int] = None) -> Any:
+        """
+        Вызов send* с файлом в поле `field`. С кэшем file_id уже загруженное
+        содержимое отправляется ссылкой на file_id, а после загрузки нового файла
+        его file_id запоминается.
+        """
+        key = None
+        if self.file_cache is not None and not isinstance(file, str):
+            file = InputFile.wrap(file)
+            key = await file.cache_key()
+            if key is not None:
+                key = f"{field}:{key}"
+                file_id = await self.file_cache.get(key, file.size)
+                if file_id is not None:
+                    payload = {name: value for name, value in fields.items() if value is not None}
+                    payload[field] = file_id
+                    try:
+                        return await self.call(method, payload, chat_id=chat_id)
+                    except TelegramBadRequest as e:
+                        if not is_rejected_file_id(e):
+                            # Ошибка не про file_id (подпись, разметка, ...) - кэш не трогаем
+                            loggers.bot.warning(f"{method} with cached file_id for {file.filename!r} failed: {e}")
+                            raise
+                        # file_id больше не принимается - загружаем файл заново
+                        loggers.bot.warning(f"Cached file_id for {file.filename!r} was rejected ({e}), uploading again")
+                        await self.file_cache.delete(key)
+        result = await self.call(method, data=await self.multipart(fields, {field: file}), chat_id=chat_id)
+        if key is not None:
+            file_id = extract_file_id(result, field)
+            if file_id is not None:
+                await self.file_cache.set(key, file_id)
+        return result
+
+    async def close_session(self) -> None:
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def __retry_after(self, response: aiohttp.ClientResponse) -> float:
+        with suppress(aiohttp.ContentTypeError, ValueError):
+            data = await response.json()
+            return float(data.get("parameters", {}).get("retry_after", 1))
+        return 1.0
+
+    async def __request(self, http_method: str, method: str, kwargs: dict, chat_id: Optional[int] = None,
+                        throttle: bool = True, acquired: bool = False, wait_retry_after: bool = True) -> aiohttp.ClientResponse:
+        """
+        Выполняет запрос с учётом ограничителя частоты и политики повторов и
+        возвращает последний ответ. Сетевая ошибка пробрасывается, если бюджет повторов исчерпан.
+        С `wait_retry_after=False` ответ 429 возвращается сразу - ожиданием управляет вызывающий.
+        """
+        session = await self.start_session()
+        idempotent = self.retry_policy.is_idempotent(method)
+        # Тело multipart можно отправить только один раз, поэтому его передают фабрикой
+        data = kwargs.get("data")
+        replayable = data is None or callable(data)
+        attempt = 0
+        total_delay = 0.0
+        while True:
+            attempt += 1
+            if throttle and self.rate_limiter is not None and not (acquired and attempt == 1):
+                await self.rate_limiter.acquire(chat_id, method)
+            if callable(data):
+                kwargs["data"] = data()
+            error = None
+            try:
+                response = await session.request(http_method, self.url + method, **kwargs)
+            except aiohttp.ClientConnectorError as e:
+                error = e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not idempotent:
+                    raise
+                error = e
+
+            if error is not None:
+                delay = self.retry_policy.backoff(attempt)
+            elif response.status == 429:
+                if not wait_retry_after:
+                    return response
+                delay = await self.__retry_after(response)
+            elif response.status >= 500 and idempotent:
+                delay = self.retry_policy.backoff(attempt)
+            else:
+                return response
+
+            if not replayable or not self.retry_policy.allows(attempt, total_delay + delay):
+                if error is not None:
+                    raise error
+                return response
+            if error is None:
+                error = f"status {response.status}"
+                response.release()
+            loggers.bot.warning(f"{method} failed ({error}), retry {attempt} in {delay:.2f}s")
+            total_delay += delay
+            await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def post(self, method: str, chat_id: Optional[int] = None, wait_retry_after: bool = True,
+                   **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        POST-запрос к методу Bot API. `chat_id` нужен ограничителю частоты; для
+        JSON-запросов он берётся из тела, для multipart его нужно передать явно.
+        `data` может быть фабрикой FormData - тогда multipart-запрос тоже повторяется.
+        """
+        if chat_id is None and "json" in kwargs:
+            chat_id = kwargs["json"].get("chat_id")
+        acquired = False
+        reply = current_webhook_reply.get()
+        if reply is not None and reply.armed and kwargs.keys() == {"json"}:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(chat_id, method)
+                acquired = True
+            if reply.capture(method, kwargs["json"]):
+                yield _WebhookReplyResponse()
+                return
+        response = await self.__request("POST", method, kwargs, chat_id=chat_id, acquired=acquired,
+                                        wait_retry_after=wait_retry_after)
+        try:
+            yield response
+        finally:
+            response.release()
+
+    @asynccontextmanager
+    async def get(self, method: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        response = await self.__request("GET", method, kwargs, throttle=False)
+        try:
+            yield response
+        finally:
+            response.release()
+
+    async def stream_file(self, file_path: str, chunk_size: int = 64 * 1024, offset: int = 0) -> AsyncIterator[bytes]:
+        """
+        Скачивает файл по file_path из getFile кусками по `chunk_size` через общий пул
+        соединений. С `offset` запрашивается только хвост файла (Range); если сервер
+        отдал файл целиком, лишнее начало пропускается.
+        """
+        session = await self.start_session()
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        # Общий таймаут сессии не подходит для больших файлов - ограничиваем только паузы в чтении
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+        try:
+            async with session.get(self.file_url + file_path, headers=headers, timeout=timeout) as response:
+                if response.status == 416:
+                    return  # Запрошенный offset - уже конец файла
+                if response.status >= 400:
+                    body = await response.read()
+                    try:
+                        data = self.json_loads(body)
+                    except ValueError:
+                        data = {}
+                    raise self.__api_error(response.status, data if isinstance(data, dict) else {})
+                skip = offset if offset and response.status != 206 else 0
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    if skip:
+                        if len(chunk) <= skip:
+                            skip -= len(chunk)
+                            continue
+                        chunk = chunk[skip:]
+                        skip = 0
+                    yield chunk
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TelegramNetworkError(f"download {file_path}: {e}")
+
+    def __api_error(self, status: int, data: dict) -> TelegramAPIError:
+        description = data.get("description") or f"HTTP {status}"
+        error_code = data.get("error_code", status)
+        if error_code == 429:
+            return TelegramRetryAfter(description, retry_after=data.get("parameters", {}).get("retry_after", 0))
+        if error_code == 401:
+            return TelegramUnauthorizedError(description)
+        if error_code == 403:
+            return TelegramForbiddenError(description)
+        if error_code == 404:
+            return TelegramNotFound(description)
+        if error_code == 409:
+            return TelegramConflictError(description)
+        if error_code >= 500:
+            return TelegramServerError(description)
+        return TelegramBadRequest(description)
+
+    async def call(self, method: str, payload: Optional[dict] = None, data: Any = None,
+                   chat_id: Optional[int] = None, http_method: str = "POST", wait_retry_after: bool = True, **kwargs) -> Any:
+        """
+        Вызывает метод Bot API и возвращает поле `result` ответа.
+
+        Тело ответа читается и декодируется один раз. Если Telegram вернул ok=false,
+        бросается исключение TelegramAPIError по коду ошибки, при сетевой ошибке - TelegramNetworkError.
+        Для вызова, отправленного в ответе на вебхук, возвращается None.
+        """
+        if data is not None:
+            kwargs["data"] = data
+        elif payload is not None:
+            kwargs["json"] = payload
+        request = self.post(method, chat_id=chat_id, wait_retry_after=wait_retry_after, **kwargs) if http_method == "POST" else self.get(method, **kwargs)
+        try:
+            async with request as response:
+                status = response.status
+                body = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TelegramNetworkError(f"{method}: {e}")
+        try:
+            decoded = self.json_loads(body)
+        except ValueError:
+            raise TelegramServerError(f"{method}: unexpected response with status {status}")
+        if not decoded.get("ok"):
+            raise self.__api_error(status, decoded)
+        return decoded.get("result")
@@ -0,0 +1,35 @@
+import json
+
+from typing import Any, Callable, Union
+
+JsonLoads = Callable[[Union[str, bytes]], Any]
+JsonDumps = Callable[[Any], str]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj).decode()
+
+
+# Самый быстрый из установленных кодеков: orjson, затем ujson, иначе стандартный json
+if orjson is not None:
+    CODEC = "orjson"
+    json_loads: JsonLoads = orjson.loads
+    json_dumps: JsonDumps = _orjson_dumps
+elif ujson is not None:
+    CODEC = "ujson"
+    json_loads = ujson.loads
+    json_dumps = ujson.dumps
+else:
+    CODEC = "json"
+    json_loads = json.loads
+    json_dumps = json.dumps
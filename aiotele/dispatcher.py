@@ -0,0 +1,123 @@
+import asyncio
+import contextvars
+from collections import deque
+
+from typing import Awaitable, Callable, Deque, Dict, Hashable, Optional, Set, Tuple
+
+from . import loggers
+from .exceptions import ValidationError
+
+
+def get_chat_key(update: dict) -> Hashable:
+    """
+    Ключ, по которому апдейты выстраиваются в очередь: id чата, а для апдейтов
+    без чата (inline_query, poll, ...) - id пользователя или самого апдейта.
+    """
+    for field in ("message", "edited_message", "channel_post", "edited_channel_post",
+                  "my_chat_member", "chat_member", "chat_join_request"):
+        event = update.get(field)
+        if event is not None:
+            return event.get("chat", {}).get("id")
+    callback = update.get("callback_query")
+    if callback is not None:
+        message = callback.get("message")
+        if message is not None:
+            return message.get("chat", {}).get("id")
+        return callback.get("from", {}).get("id")
+    for event in update.values():
+        if isinstance(event, dict) and "from" in event:
+            return event["from"].get("id")
+    return ("update", update.get("update_id"))
+
+
+class Dispatcher:
+    """
+    Пул воркеров для обработки апдейтов.
+
+    Разные чаты обрабатываются параллельно (не больше `concurrency` одновременно),
+    апдейты одного чата - строго по очереди, в порядке поступления.
+    """
+
+    def __init__(self, handler: Callable[[dict], Awaitable[None]], concurrency: int = 100, max_pending: int = 10000):
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise ValidationError(f"Expected 'concurrency' to be a positive integer, got {concurrency!r}")
+        if not isinstance(max_pending, int) or max_pending < 1:
+            raise ValidationError(f"Expected 'max_pending' to be a positive integer, got {max_pending!r}")
+        self.__handler = handler
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+
+        self.__queues: Dict[Hashable, Deque[Tuple[dict, Optional[contextvars.Context]]]] = {}  # {ключ чата: апдейты, ожидающие обработки}
+        self.__ready: Optional[asyncio.Queue] = None  # ключи чатов, которые можно брать в работу
+        self.__slots: Optional[asyncio.Semaphore] = None
+        self.__workers: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self.__workers)
+
+    @property
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self.__queues.values())
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.__ready = asyncio.Queue()
+        self.__slots = asyncio.Semaphore(self.max_pending)
+        for _ in range(self.concurrency):
+            self.__workers.add(asyncio.create_task(self.__worker()))
+
+    async def feed(self, update: dict, context: Optional[contextvars.Context] = None) -> None:
+        """
+        Ставит апдейт в очередь его чата. Ждёт, если очередь переполнена.
+        Если передан `context`, хендлер выполняется в нём (так режим вебхука передаёт слот ответа).
+        """
+        if not self.running:
+            self.start()
+        # Ключ до захвата слота: ошибка в апдейте не должна занимать слот навсегда
+        key = get_chat_key(update)
+        await self.__slots.acquire()
+        queue = self.__queues.get(key)
+        if queue is not None:
+            # Чат уже в работе или ждёт воркера - апдейт будет обработан после предыдущих
+            queue.append((update, context))
+            return
+        self.__queues[key] = deque(((update, context),))
+        self.__ready.put_nowait(key)
+
+    async def __worker(self) -> None:
+        while True:
+            key = await self.__ready.get()
+            queue = self.__queues[key]
+            update, context = queue.popleft()
+            try:
+                if context is None:
+                    await self.__handler(update)
+                else:
+                    await asyncio.create_task(self.__handler(update), context=context)
+            except Exception:
+                loggers.event.exception("Failed to handle update %s", update.get("update_id"))
+            finally:
+                self.__slots.release()
+                if queue:
+                    self.__ready.put_nowait(key)
+                else:
+                    del self.__queues[key]
+                self.__ready.task_done()
+
+    async def wait(self) -> None:
+        """Ждёт, пока будут обработаны все поставленные в очередь апдейты."""
+        if self.running:
+            await self.__ready.join()
+
+    async def close(self, wait: bool = True) -> None:
+        if not self.running:
+            return
+        if wait:
+            await self.wait()
+        for worker in self.__workers:
+            worker.cancel()
+        await asyncio.gather(*self.__workers, return_exceptions=True)
+        self.__workers.clear()
+        self.__queues.clear()
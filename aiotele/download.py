@@ -0,0 +1,60 @@
+import asyncio
+import hashlib
+import os
+
+from typing import Any, AsyncIterator, BinaryIO, Callable, NamedTuple, Optional, Union
+
+from .exceptions import ValidationError
+
+Destination = Union[str, os.PathLike, BinaryIO]
+
+
+class Downloaded(NamedTuple):
+    destination: Destination
+    size: int  # Размер файла, включая докачанную ранее часть
+    checksum: Optional[str] = None  # hexdigest всего файла, если был запрошен `checksum`
+
+
+def _hash_file(path: str, checksum: str, chunk_size: int) -> Any:
+    digest = hashlib.new(checksum)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest
+
+
+async def save_stream(stream: Callable[[int], AsyncIterator[bytes]], destination: Destination,
+                      chunk_size: int = 64 * 1024, resume: bool = False, checksum: Optional[str] = None) -> Downloaded:
+    """
+    Записывает поток `stream(offset)` в путь или бинарный файл. Запись и хэширование
+    идут кусками в пуле потоков, поэтому память не зависит от размера файла.
+
+    С `resume=True` уже скачанная часть файла по пути не перекачивается:
+    поток запрашивается с её конца, а при `checksum` она дочитывается с диска в хэш.
+    """
+    if checksum is not None and checksum not in hashlib.algorithms_available:
+        raise ValidationError(f"Unknown checksum algorithm {checksum!r}")
+    path = os.fspath(destination) if isinstance(destination, (str, os.PathLike)) else None
+    offset = 0
+    digest = hashlib.new(checksum) if checksum else None
+    if path is not None:
+        if resume:
+            offset = await asyncio.to_thread(lambda: os.path.getsize(path) if os.path.exists(path) else 0)
+            if offset and digest is not None:
+                digest = await asyncio.to_thread(_hash_file, path, checksum, chunk_size)
+        file = await asyncio.to_thread(open, path, "ab" if offset else "wb")
+    else:
+        if not hasattr(destination, "write"):
+            raise ValidationError(f"Expected a path or a binary file, got {type(destination).__name__}")
+        file = destination
+    size = offset
+    try:
+        async for chunk in stream(offset):
+            if digest is not None:
+                digest.update(chunk)
+            await asyncio.to_thread(file.write, chunk)
+            size += len(chunk)
+    finally:
+        if path is not None:
+            await asyncio.to_thread(file.close)
+    return Downloaded(destination, size, digest.hexdigest() if digest is not None else None)
@@ -58,3 +58,32 @@ class TelegramNetworkError(DetailedAioTeleError):
     """
     Network communication error.
     """
+
+class TelegramUnauthorizedError(TelegramAPIError):
+    """
+    The bot token is invalid or has been revoked
+    """
+
+class TelegramForbiddenError(TelegramAPIError):
+    """
+    The bot has no access to the chat: it was blocked, kicked or the user is deactivated
+    """
+
+class TelegramNotFound(TelegramAPIError):
+    """
+    The requested chat, message or method was not found
+    """
+
+class TelegramRetryAfter(TelegramAPIError):
+    """
+    Flood control exceeded, the request may be repeated after `retry_after` seconds
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message=message)
+        self.retry_after = retry_after
+
+class TelegramServerError(TelegramAPIError):
+    """
+    Telegram server returned 5xx
+    """
@@ -0,0 +1,149 @@
+import asyncio
+import sqlite3
+import time
+from collections import OrderedDict
+
+from typing import Any, Optional
+
+from . import loggers
+from .exceptions import ValidationError
+
+# Ответы Telegram на file_id, который больше не принимается (в нижнем регистре, "_" заменены пробелами)
+REJECTED_FILE_ID_ERRORS = ("wrong file identifier", "file reference expired", "wrong remote file")
+
+
+def is_rejected_file_id(error: Exception) -> bool:
+    """Ошибка означает, что Telegram не принял file_id из кэша."""
+    text = str(error).lower().replace("_", " ")
+    return any(message in text for message in REJECTED_FILE_ID_ERRORS)
+
+
+def extract_file_id(result: Any, field: str) -> Optional[str]:
+    """file_id загруженного файла из ответа send*: для фото - самый большой размер."""
+    if not isinstance(result, dict):
+        return None
+    value = result.get(field)
+    if isinstance(value, list):
+        value = value[-1] if value else None
+    return value.get("file_id") if isinstance(value, dict) else None
+
+
+class FileIdCache:
+    """
+    Кэш file_id загруженных файлов: повторная отправка того же содержимого
+    уходит ссылкой на file_id, без загрузки байтов.
+
+    Ключ - содержимое файла (см. InputFile.cache_key) и тип медиа. В памяти
+    хранится не больше `max_size` записей, вытесняются давно не использованные.
+    С `path` кэш хранится в файле SQLite и переживает перезапуск бота;
+    запросы к нему выполняются в отдельном потоке.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: int = 10000):
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValidationError(f"Expected 'max_size' to be a positive integer, got {max_size!r}")
+        self.path = path
+        self.max_size = max_size
+        self.__entries: "OrderedDict[str, str]" = OrderedDict()  # {ключ: file_id}, от давно использованных к недавним
+        self.__touched = set()  # Ключи, использованные после загрузки с диска; время записывается в close()
+        self.__connection: Optional[sqlite3.Connection] = None
+        self.__loaded = path is None
+        self.__lock = asyncio.Lock()
+
+        # Метрики
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0  # Сколько байт не пришлось загружать благодаря кэшу
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __connect(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS file_ids (key TEXT PRIMARY KEY, file_id TEXT NOT NULL, used REAL NOT NULL)"
+            )
+            self.__connection.commit()
+        return self.__connection
+
+    def __load_rows(self) -> list:
+        return self.__connect().execute(
+            "SELECT key, file_id FROM (SELECT * FROM file_ids ORDER BY used DESC LIMIT ?) ORDER BY used", (self.max_size,)
+        ).fetchall()
+
+    def __write(self, key: str, file_id: Optional[str], evicted: list) -> None:
+        connection = self.__connect()
+        if file_id is None:
+            connection.execute("DELETE FROM file_ids WHERE key = ?", (key,))
+        else:
+            connection.execute("INSERT OR REPLACE INTO file_ids (key, file_id, used) VALUES (?, ?, ?)", (key, file_id, time.time()))
+        connection.executemany("DELETE FROM file_ids WHERE key = ?", [(item,) for item in evicted])
+        connection.commit()
+
+    def __touch(self, keys: list) -> None:
+        connection = self.__connect()
+        now = time.time()
+        # Порядок ключей сохраняет порядок LRU
+        connection.executemany("UPDATE file_ids SET used = ? WHERE key = ?", [(now + number * 1e-6, key) for number, key in enumerate(keys)])
+        connection.commit()
+
+    async def __load(self) -> None:
+        async with self.__lock:
+            if self.__loaded:
+                return
+            for key, file_id in await asyncio.to_thread(self.__load_rows):
+                self.__entries[key] = file_id
+            self.__loaded = True
+            loggers.bot.debug("Loaded %d cached file_id(s) from %s", len(self.__entries), self.path)
+
+    async def get(self, key: str, size: Optional[int] = None) -> Optional[str]:
+        if not self.__loaded:
+            await self.__load()
+        file_id = self.__entries.get(key)
+        if file_id is None:
+            self.misses += 1
+            return None
+        self.__entries.move_to_end(key)
+        self.__touched.add(key)
+        self.hits += 1
+        if size:
+            self.saved_bytes += size
+        return file_id
+
+    async def set(self, key: str, file_id: str) -> None:
+        if not self.__loaded:
+            await self.__load()
+        self.__entries[key] = file_id
+        self.__entries.move_to_end(key)
+        evicted = []
+        while len(self.__entries) > self.max_size:
+            evicted.append(self.__entries.popitem(last=False)[0])
+        self.__touched.difference_update(evicted)
+        if self.path is not None:
+            async with self.__lock:
+                await asyncio.to_thread(self.__write, key, file_id, evicted)
+
+    async def delete(self, key: str) -> None:
+        """Удаляет запись, например если Telegram перестал принимать file_id."""
+        self.__entries.pop(key, None)
+        self.__touched.discard(key)
+        if self.path is not None:
+            async with self.__lock:
+                await asyncio.to_thread(self.__write, key, None, [])
+
+    async def close(self) -> None:
+        if self.__connection is None:
+            return
+        async with self.__lock:
+            touched = [key for key in self.__entries if key in self.__touched]
+            if touched:
+                await asyncio.to_thread(self.__touch, touched)
+            self.__touched.clear()
+            await asyncio.to_thread(self.__connection.close)
+            self.__connection = None
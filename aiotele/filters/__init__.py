@@ -0,0 +1,6 @@
+from .base import *
+from .text import *
+from .command import *
+from .chat import *
+from .content import *
+from .callback import *
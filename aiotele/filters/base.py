@@ -0,0 +1,132 @@
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+IndexKey = Tuple[str, FrozenSet[Any]]  # (измерение, значения), например ("chat_type", {"private"})
+
+# Как достать из события значение измерения индекса: {измерение: функция}
+EXTRACTORS: Dict[str, Callable[[dict], Any]] = {}
+
+
+def get_chat(event: dict) -> dict:
+    """Чат сообщения; для callback_query - чат сообщения с кнопкой."""
+    chat = event.get("chat")
+    if chat is None:
+        chat = event.get("message", {}).get("chat", {})
+    return chat
+
+
+def get_text(event: dict) -> Optional[str]:
+    """Текст сообщения или подпись к медиа."""
+    text = event.get("text")
+    return text if text is not None else event.get("caption")
+
+
+class Filter:
+    """
+    Предикат над сырым событием апдейта (словарь message или callback_query).
+
+    Фильтры комбинируются через `&`, `|` и `~`. `cost` - условная стоимость
+    проверки: составные фильтры проверяют части от дешёвых к дорогим и
+    останавливаются на первом решающем результате.
+    """
+
+    cost: int = 1
+
+    def check(self, event: dict) -> bool:
+        raise NotImplementedError
+
+    def __call__(self, event: dict) -> bool:
+        return self.check(event)
+
+    def index_key(self) -> Optional[IndexKey]:
+        """
+        Значения, без которых фильтр заведомо не пройдёт. По ним роутер
+        раскладывает хендлеры по корзинам, чтобы не проверять каждый на каждом апдейте.
+        """
+        return None
+
+    def bind(self, bot_username: Optional[str]) -> None:
+        """Username бота из getMe; роутер передаёт его при сборке (нужен, например, Command)."""
+
+    def __and__(self, other: "Filter") -> "Filter":
+        return AndFilter(self, other)
+
+    def __or__(self, other: "Filter") -> "Filter":
+        return OrFilter(self, other)
+
+    def __invert__(self) -> "Filter":
+        return InvertFilter(self)
+
+
+class AndFilter(Filter):
+    def __init__(self, *filters: Filter):
+        parts = []
+        for item in filters:
+            # (a & b) & c разворачивается в один список, чтобы сортировка по стоимости работала на всём выражении
+            parts.extend(item.filters if isinstance(item, AndFilter) else (item,))
+        self.filters = tuple(sorted(parts, key=lambda item: item.cost))
+        self.cost = sum(item.cost for item in self.filters)
+
+    def check(self, event: dict) -> bool:
+        return all(item.check(event) for item in self.filters)
+
+    def bind(self, bot_username: Optional[str]) -> None:
+        for item in self.filters:
+            item.bind(bot_username)
+
+    def index_key(self) -> Optional[IndexKey]:
+        # Фильтры уже отсортированы, поэтому берём самый дешёвый индексируемый
+        for item in self.filters:
+            key = item.index_key()
+            if key is not None:
+                return key
+        return None
+
+
+class OrFilter(Filter):
+    def __init__(self, *filters: Filter):
+        parts = []
+        for item in filters:
+            parts.extend(item.filters if isinstance(item, OrFilter) else (item,))
+        self.filters = tuple(sorted(parts, key=lambda item: item.cost))
+        self.cost = sum(item.cost for item in self.filters)
+
+    def check(self, event: dict) -> bool:
+        return any(item.check(event) for item in self.filters)
+
+    def bind(self, bot_username: Optional[str]) -> None:
+        for item in self.filters:
+            item.bind(bot_username)
+
+    def index_key(self) -> Optional[IndexKey]:
+        # Индексируется, только если все ветки индексируются по одному измерению
+        keys = [item.index_key() for item in self.filters]
+        if not keys or None in keys or len({dimension for dimension, _ in keys}) != 1:
+            return None
+        return keys[0][0], frozenset().union(*(values for _, values in keys))
+
+
+class InvertFilter(Filter):
+    def __init__(self, inner: Filter):
+        self.inner = inner
+        self.cost = inner.cost
+
+    def check(self, event: dict) -> bool:
+        return not self.inner.check(event)
+
+    def bind(self, bot_username: Optional[str]) -> None:
+        self.inner.bind(bot_username)
+
+
+class FuncFilter(Filter):
+    """Фильтр из произвольной функции `func(event) -> bool`."""
+
+    def __init__(self, func: Callable[[dict], bool], cost: int = 5):
+        self.func = func
+        self.cost = cost
+
+    def check(self, event: dict) -> bool:
+        return bool(self.func(event))
+
+
+def all_of(*filters: Filter) -> Filter:
+    return filters[0] if len(filters) == 1 else AndFilter(*filters)
@@ -0,0 +1,36 @@
+import re
+
+from typing import Iterable, Optional, Pattern, Union
+
+from ..exceptions import ValidationError
+from .base import EXTRACTORS, Filter, IndexKey
+
+EXTRACTORS["data"] = lambda event: event.get("data")
+
+
+class CallbackDataFilter(Filter):
+    """`data` нажатой inline-кнопки: точное совпадение, префикс или регулярное выражение."""
+
+    def __init__(self, equals: Union[str, Iterable[str]] = None, startswith: Union[str, Iterable[str]] = None,
+                 regexp: Union[str, Pattern] = None):
+        if equals is None and startswith is None and regexp is None:
+            raise ValidationError("CallbackDataFilter needs at least one of 'equals', 'startswith', 'regexp'")
+        self.equals = frozenset((equals,) if isinstance(equals, str) else equals or ())
+        self.startswith = (startswith,) if isinstance(startswith, str) else tuple(startswith or ())
+        self.regexp = re.compile(regexp) if isinstance(regexp, str) else regexp
+        self.cost = 10 if self.regexp is not None else 2 if self.startswith else 1
+
+    def check(self, event: dict) -> bool:
+        data = event.get("data")
+        if data is None:
+            return False
+        if data in self.equals:
+            return True
+        if self.startswith and data.startswith(self.startswith):
+            return True
+        return self.regexp is not None and self.regexp.search(data) is not None
+
+    def index_key(self) -> Optional[IndexKey]:
+        if self.equals and not self.startswith and self.regexp is None:
+            return "data", self.equals
+        return None
@@ -0,0 +1,35 @@
+from typing import Iterable, Optional
+
+from ..exceptions import ValidationError
+from .base import EXTRACTORS, Filter, IndexKey, get_chat
+
+EXTRACTORS["chat_type"] = lambda event: get_chat(event).get("type")
+EXTRACTORS["user_id"] = lambda event: event.get("from", {}).get("id")
+
+
+class ChatType(Filter):
+    """Тип чата: "private", "group", "supergroup" или "channel"."""
+
+    def __init__(self, *chat_types: str):
+        if not chat_types:
+            raise ValidationError("ChatType filter needs at least one chat type")
+        self.chat_types = frozenset(chat_types)
+
+    def check(self, event: dict) -> bool:
+        return get_chat(event).get("type") in self.chat_types
+
+    def index_key(self) -> Optional[IndexKey]:
+        return "chat_type", self.chat_types
+
+
+class UserId(Filter):
+    """Автор сообщения или нажатия входит в множество id (например, список админов)."""
+
+    def __init__(self, user_ids: Iterable[int]):
+        self.user_ids = frozenset(user_ids)
+
+    def check(self, event: dict) -> bool:
+        return event.get("from", {}).get("id") in self.user_ids
+
+    def index_key(self) -> Optional[IndexKey]:
+        return "user_id", self.user_ids
@@ -0,0 +1,58 @@
+from typing import Iterable, Optional, Tuple, Union
+
+from ..exceptions import ValidationError
+from .base import EXTRACTORS, Filter, IndexKey, get_text
+
+
+def split_command(event: dict) -> Tuple[Optional[str], Optional[str]]:
+    """Первое слово текста и суффикс @botname: "/start@bot arg" -> ("/start", "bot")."""
+    text = get_text(event)
+    if not text:
+        return None, None
+    parts = text.split(None, 1)
+    if not parts:
+        return None, None
+    command, _, mention = parts[0].partition("@")
+    return command, mention or None
+
+
+def get_command(event: dict) -> Optional[str]:
+    """Первое слово текста без суффикса @botname: "/start@bot arg" -> "/start"."""
+    return split_command(event)[0]
+
+
+EXTRACTORS["command"] = get_command
+
+
+class Command(Filter):
+    """
+    Сообщение начинается с одной из команд. `prefix` - допустимые префиксы
+    (каждый символ строки или элемент списка), команды указываются без префикса.
+
+    Команда вида /start@botname проходит, только если это username самого бота
+    (его передаёт роутер через `bind`) - команды другим ботам в группе игнорируются.
+    """
+
+    def __init__(self, *commands: str, prefix: Union[str, Iterable[str]] = "/", ignore_case: bool = False):
+        if not commands:
+            raise ValidationError("Command filter needs at least one command")
+        self.ignore_case = ignore_case
+        self.bot_username: Optional[str] = None
+        self.commands = frozenset(
+            (p + command).lower() if ignore_case else p + command
+            for command in commands for p in prefix
+        )
+
+    def bind(self, bot_username: Optional[str]) -> None:
+        self.bot_username = bot_username
+
+    def check(self, event: dict) -> bool:
+        command, mention = split_command(event)
+        if command is None:
+            return False
+        if mention is not None and (self.bot_username is None or mention.lower() != self.bot_username.lower()):
+            return False
+        return (command.lower() if self.ignore_case else command) in self.commands
+
+    def index_key(self) -> Optional[IndexKey]:
+        return None if self.ignore_case else ("command", self.commands)
@@ -0,0 +1,38 @@
+from typing import Optional
+
+from ..exceptions import ValidationError
+from .base import EXTRACTORS, Filter, IndexKey
+
+# Поля сообщения, определяющие тип содержимого; проверяются по порядку
+CONTENT_TYPES = (
+    "text", "photo", "video", "animation", "audio", "document", "sticker", "voice", "video_note",
+    "contact", "dice", "poll", "venue", "location", "new_chat_members", "left_chat_member",
+    "new_chat_title", "new_chat_photo", "pinned_message", "successful_payment", "web_app_data",
+)
+
+
+def get_content_type(event: dict) -> Optional[str]:
+    for content_type in CONTENT_TYPES:
+        if content_type in event:
+            return content_type
+    return None
+
+
+EXTRACTORS["content_type"] = get_content_type
+
+
+class ContentType(Filter):
+    """Тип содержимого сообщения: "text", "photo", "document" и т.д."""
+
+    cost = 2
+
+    def __init__(self, *content_types: str):
+        if not content_types:
+            raise ValidationError("ContentType filter needs at least one content type")
+        self.content_types = frozenset(content_types)
+
+    def check(self, event: dict) -> bool:
+        return get_content_type(event) in self.content_types
+
+    def index_key(self) -> Optional[IndexKey]:
+        return "content_type", self.content_types
@@ -0,0 +1,68 @@
+import re
+
+from typing import Iterable, Optional, Pattern, Tuple, Union
+
+from ..exceptions import ValidationError
+from .base import EXTRACTORS, Filter, IndexKey, get_text
+
+EXTRACTORS["text"] = get_text
+
+
+def _as_tuple(value: Union[str, Iterable[str], None]) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+class Text(Filter):
+    """
+    Текст сообщения (или подпись к медиа): точное совпадение, начало, конец или вхождение.
+    Каждый аргумент принимает строку или список строк.
+    """
+
+    def __init__(self, equals: Union[str, Iterable[str]] = None, startswith: Union[str, Iterable[str]] = None,
+                 endswith: Union[str, Iterable[str]] = None, contains: Union[str, Iterable[str]] = None,
+                 ignore_case: bool = False):
+        if equals is None and startswith is None and endswith is None and contains is None:
+            raise ValidationError("Text filter needs at least one of 'equals', 'startswith', 'endswith', 'contains'")
+        prepare = (lambda values: tuple(value.lower() for value in values)) if ignore_case else (lambda values: values)
+        self.equals = frozenset(prepare(_as_tuple(equals)))
+        self.startswith = prepare(_as_tuple(startswith))
+        self.endswith = prepare(_as_tuple(endswith))
+        self.contains = prepare(_as_tuple(contains))
+        self.ignore_case = ignore_case
+        self.cost = 1 if not (self.startswith or self.endswith or self.contains) else 2
+
+    def check(self, event: dict) -> bool:
+        text = get_text(event)
+        if text is None:
+            return False
+        if self.ignore_case:
+            text = text.lower()
+        if self.equals and text in self.equals:
+            return True
+        if self.startswith and text.startswith(self.startswith):
+            return True
+        if self.endswith and text.endswith(self.endswith):
+            return True
+        return any(value in text for value in self.contains)
+
+    def index_key(self) -> Optional[IndexKey]:
+        if self.equals and not self.ignore_case and not (self.startswith or self.endswith or self.contains):
+            return "text", self.equals
+        return None
+
+
+class Regexp(Filter):
+    """Текст сообщения совпадает с регулярным выражением (`re.search`). Шаблон компилируется один раз."""
+
+    cost = 10
+
+    def __init__(self, pattern: Union[str, Pattern], flags: int = 0):
+        self.pattern = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, flags)
+
+    def check(self, event: dict) -> bool:
+        text = get_text(event)
+        return text is not None and self.pattern.search(text) is not None
@@ -0,0 +1,5 @@
+from .state import *
+from .storage import *
+from .context import *
+from .middleware import *
+from .state_filter import *
@@ -0,0 +1,67 @@
+from contextvars import ContextVar
+
+from typing import Any, Dict, Optional, Union
+
+from .. import loggers
+from .state import State
+from .storage import BaseStorage, StorageKey
+
+
+class FSMContext:
+    """
+    Состояние пользователя в чате на время обработки одного апдейта.
+
+    Запись загружается из хранилища один раз, до роутинга; изменения копятся
+    и сохраняются одной записью после того, как хендлер отработал.
+    """
+
+    __slots__ = ("storage", "key", "__state", "__data", "modified")
+
+    def __init__(self, storage: BaseStorage, key: StorageKey, state: Optional[str] = None, data: Optional[Dict[str, Any]] = None):
+        self.storage = storage
+        self.key = key
+        self.__state = state
+        self.__data = data if data is not None else {}
+        self.modified = False
+
+    @property
+    def state(self) -> Optional[str]:
+        return self.__state
+
+    async def get_state(self) -> Optional[str]:
+        return self.__state
+
+    async def set_state(self, state: Union[State, str, None] = None) -> None:
+        state = state.state if isinstance(state, State) else state
+        loggers.scene.debug("State of %s changed: %s -> %s", self.key, self.__state, state)
+        self.__state = state
+        self.modified = True
+
+    async def get_data(self) -> Dict[str, Any]:
+        return dict(self.__data)
+
+    async def set_data(self, data: Dict[str, Any]) -> None:
+        self.__data = dict(data)
+        self.modified = True
+
+    async def update_data(self, data: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Dict[str, Any]:
+        if data:
+            self.__data.update(data)
+        self.__data.update(kwargs)
+        self.modified = True
+        return dict(self.__data)
+
+    async def clear(self) -> None:
+        self.__state = None
+        self.__data = {}
+        self.modified = True
+
+    async def save(self) -> None:
+        """Записывает изменения в хранилище; вызывается мидлварью после обработки апдейта."""
+        if self.modified:
+            await self.storage.set(self.key, self.__state, self.__data)
+            self.modified = False
+
+
+# Контекст FSM текущего апдейта; по нему StateFilter проверяет состояние без обращения к хранилищу
+current_fsm_context: ContextVar[Optional[FSMContext]] = ContextVar("current_fsm_context", default=None)
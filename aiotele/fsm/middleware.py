@@ -0,0 +1,48 @@
+from typing import Any, Dict, Optional
+
+from .. import loggers
+from ..filters.base import get_chat
+from ..middlewares import BaseMiddleware, Handler
+from ..types import Update
+from .context import FSMContext, current_fsm_context
+from .storage import BaseStorage, StorageKey
+
+
+def get_storage_key(event: Optional[dict]) -> Optional[StorageKey]:
+    """Ключ (chat_id, user_id) события; для событий без автора (channel_post, poll, ...) - None."""
+    if not isinstance(event, dict):
+        return None
+    user_id = event.get("from", {}).get("id")
+    if user_id is None:
+        return None
+    chat_id = get_chat(event).get("id")
+    # inline_query и прочие события вне чата привязываются к личному "чату" пользователя
+    return (chat_id if chat_id is not None else user_id), user_id
+
+
+class FSMMiddleware(BaseMiddleware):
+    """
+    Внешняя мидлварь FSM: до роутинга одним чтением загружает состояние и данные
+    пользователя, кладёт FSMContext в `data["state"]`, а после обработки
+    сохраняет изменения одной записью. Добавляется ботом при передаче `storage`.
+    """
+
+    def __init__(self, storage: BaseStorage):
+        self.storage = storage
+
+    async def __call__(self, handler: Handler, event: Any, data: Dict[str, Any]) -> Any:
+        key = get_storage_key(Update(event).event)
+        if key is None:
+            return await handler(event, data)
+        state, values = await self.storage.get(key)
+        context = FSMContext(self.storage, key, state, values)
+        data["state"] = context
+        token = current_fsm_context.set(context)
+        try:
+            return await handler(event, data)
+        finally:
+            current_fsm_context.reset(token)
+            try:
+                await context.save()
+            except Exception:
+                loggers.scene.exception("Failed to save state of %s", key)
@@ -0,0 +1,46 @@
+from typing import Optional, Tuple
+
+
+class State:
+    """
+    Шаг диалога. Имя задаётся автоматически по группе и атрибуту:
+
+        class Form(StatesGroup):
+            name = State()     # "Form:name"
+            age = State()      # "Form:age"
+    """
+
+    def __init__(self, state: Optional[str] = None):
+        self.state = state
+        self.group: Optional[type] = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        if self.state is None:
+            self.state = f"{owner.__name__}:{name}"
+        self.group = owner
+
+    def __str__(self) -> str:
+        return self.state
+
+    def __repr__(self) -> str:
+        return f"State({self.state!r})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, State):
+            return self.state == other.state
+        if isinstance(other, str):
+            return self.state == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.state)
+
+
+class StatesGroup:
+    """Группа состояний одного диалога. `states` - её состояния в порядке объявления."""
+
+    states: Tuple[State, ...] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.states = tuple(value for value in vars(cls).values() if isinstance(value, State))
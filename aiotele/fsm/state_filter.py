@@ -0,0 +1,50 @@
+from typing import Optional, Union
+
+from ..exceptions import ValidationError
+from ..filters.base import EXTRACTORS, Filter, IndexKey
+from .context import current_fsm_context
+from .state import State, StatesGroup
+
+
+def get_state(event: dict = None) -> Optional[str]:
+    """Текущее состояние пользователя; уже загружено мидлварью, поэтому без обращения к хранилищу."""
+    context = current_fsm_context.get()
+    return context.state if context is not None else None
+
+
+EXTRACTORS["state"] = get_state
+
+
+class StateFilter(Filter):
+    """
+    Текущее состояние пользователя входит в перечисленные.
+
+        StateFilter(Form.name)    # конкретное состояние
+        StateFilter(Form)         # любое состояние группы
+        StateFilter(None)         # пользователь вне диалога
+        StateFilter("*")          # любое состояние
+    """
+
+    def __init__(self, *states: Union[State, type, str, None]):
+        if not states:
+            raise ValidationError("StateFilter needs at least one state")
+        names = set()
+        self.any = False
+        for state in states:
+            if state == "*":
+                self.any = True
+            elif isinstance(state, State):
+                names.add(state.state)
+            elif isinstance(state, type) and issubclass(state, StatesGroup):
+                names.update(item.state for item in state.states)
+            elif state is None or isinstance(state, str):
+                names.add(state)
+            else:
+                raise ValidationError(f"Expected a State, StatesGroup, str or None, got {state!r}")
+        self.states = frozenset(names)
+
+    def check(self, event: dict) -> bool:
+        return self.any or get_state() in self.states
+
+    def index_key(self) -> Optional[IndexKey]:
+        return None if self.any else ("state", self.states)
@@ -0,0 +1,135 @@
+import asyncio
+import sqlite3
+import time
+
+from typing import Any, Dict, Optional, Tuple
+
+from ..cache import TTLCache
+from ..codecs import json_dumps, json_loads
+
+StorageKey = Tuple[int, int]  # (chat_id, user_id)
+Record = Tuple[Optional[str], Dict[str, Any]]  # (состояние, данные)
+
+
+class BaseStorage:
+    """
+    Интерфейс хранилища состояний. Состояние и данные читаются одним вызовом `get`,
+    поэтому на апдейт приходится не больше одного чтения и одной записи.
+    Для внешних хранилищ (Redis, БД) достаточно реализовать эти методы.
+    """
+
+    async def get(self, key: StorageKey) -> Record:
+        raise NotImplementedError
+
+    async def set(self, key: StorageKey, state: Optional[str], data: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: StorageKey) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryStorage(BaseStorage):
+    """
+    Хранилище в памяти процесса. Запись без активности дольше `ttl` секунд
+    удаляется, а при `max_size` записей вытесняется самая старая.
+    """
+
+    def __init__(self, ttl: Optional[float] = 3600.0, max_size: int = 100000):
+        self.__records = TTLCache(maxsize=max_size, ttl=ttl)
+
+    def __len__(self) -> int:
+        return len(self.__records)
+
+    async def get(self, key: StorageKey) -> Record:
+        record = self.__records.get(key)
+        if record is None:
+            return None, {}
+        state, data = record
+        return state, dict(data)
+
+    async def set(self, key: StorageKey, state: Optional[str], data: Dict[str, Any]) -> None:
+        if state is None and not data:
+            self.__records.pop(key)
+            return
+        self.__records.set(key, (state, dict(data)))
+
+    async def delete(self, key: StorageKey) -> None:
+        self.__records.pop(key)
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    Хранилище в файле SQLite: состояния переживают перезапуск бота.
+    Запросы выполняются в отдельном потоке, данные хранятся в JSON.
+    С `ttl` устаревшие записи не возвращаются и удаляются при `vacuum`.
+    """
+
+    def __init__(self, path: str = "aiotele_fsm.sqlite3", ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        self.__connection: Optional[sqlite3.Connection] = None
+        self.__lock = asyncio.Lock()
+
+    def __connect(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            self.__connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS fsm ("
+                "chat_id INTEGER NOT NULL, user_id INTEGER NOT NULL, state TEXT, data TEXT NOT NULL, "
+                "updated REAL NOT NULL, PRIMARY KEY (chat_id, user_id))"
+            )
+            self.__connection.commit()
+        return self.__connection
+
+    async def __run(self, func, *args):
+        async with self.__lock:
+            return await asyncio.to_thread(func, *args)
+
+    def __get(self, key: StorageKey) -> Record:
+        row = self.__connect().execute(
+            "SELECT state, data, updated FROM fsm WHERE chat_id = ? AND user_id = ?", key
+        ).fetchone()
+        if row is None or (self.ttl and row[2] + self.ttl <= time.time()):
+            return None, {}
+        return row[0], json_loads(row[1])
+
+    def __set(self, key: StorageKey, state: Optional[str], data: Dict[str, Any]) -> None:
+        connection = self.__connect()
+        if state is None and not data:
+            connection.execute("DELETE FROM fsm WHERE chat_id = ? AND user_id = ?", key)
+        else:
+            connection.execute(
+                "INSERT OR REPLACE INTO fsm (chat_id, user_id, state, data, updated) VALUES (?, ?, ?, ?, ?)",
+                (*key, state, json_dumps(data), time.time()),
+            )
+        connection.commit()
+
+    def __vacuum(self) -> int:
+        connection = self.__connect()
+        removed = connection.execute("DELETE FROM fsm WHERE updated <= ?", (time.time() - self.ttl,)).rowcount
+        connection.commit()
+        return removed
+
+    async def get(self, key: StorageKey) -> Record:
+        return await self.__run(self.__get, key)
+
+    async def set(self, key: StorageKey, state: Optional[str], data: Dict[str, Any]) -> None:
+        await self.__run(self.__set, key, state, data)
+
+    async def delete(self, key: StorageKey) -> None:
+        await self.__run(self.__set, key, None, {})
+
+    async def vacuum(self) -> int:
+        """Удаляет записи старше `ttl` и возвращает их число."""
+        if not self.ttl:
+            return 0
+        return await self.__run(self.__vacuum)
+
+    async def close(self) -> None:
+        if self.__connection is not None:
+            await self.__run(self.__connection.close)
+            self.__connection = None
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import io
+import mimetypes
+import os
+
+from typing import Any, AsyncIterable, AsyncIterator, BinaryIO, Optional, Union
+
+from .exceptions import ValidationError
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+Source = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO, AsyncIterable[bytes]]
+
+
+class InputFile:
+    """
+    Файл для загрузки в Telegram.
+
+    Источник - путь, bytes/bytearray/memoryview, открытый бинарный файл или
+    асинхронный итератор байтов. Файлы читаются кусками по `chunk_size` в пуле
+    потоков и отправляются потоком, поэтому большой файл не блокирует цикл
+    событий и не копируется в память целиком.
+
+    Путь, байты и файл с поддержкой seek можно отправить повторно (например,
+    при ретрае после 429); асинхронный итератор читается только один раз.
+    """
+
+    def __init__(self, source: Source, filename: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if isinstance(source, InputFile):
+            raise ValidationError("Source is already an InputFile")
+        if isinstance(source, (str, os.PathLike)):
+            self.path: Optional[str] = os.fspath(source)
+            filename = filename or os.path.basename(self.path)
+        else:
+            self.path = None
+            if not isinstance(source, (bytes, bytearray, memoryview)) and not hasattr(source, "read") \
+                    and not hasattr(source, "__aiter__"):
+                raise ValidationError(f"Unsupported file source: {type(source).__name__}")
+            if filename is None:
+                name = getattr(source, "name", None)
+                filename = os.path.basename(name) if isinstance(name, str) else "file"
+        self.source = source
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        self.size: Optional[int] = len(source) if isinstance(source, (bytes, bytearray, memoryview)) else None
+        self.__stat: Optional[os.stat_result] = None
+        self.__start: Optional[int] = None  # Начальная позиция файлового объекта для повторной отправки
+        self.__consumed = False
+
+    @classmethod
+    def wrap(cls, value: Union["InputFile", Source]) -> "InputFile":
+        return value if isinstance(value, InputFile) else cls(value)
+
+    @property
+    def replayable(self) -> bool:
+        if self.path is not None or isinstance(self.source, (bytes, bytearray, memoryview)):
+            return True
+        if hasattr(self.source, "read"):
+            seekable = getattr(self.source, "seekable", None)
+            return bool(seekable and seekable())
+        return False
+
+    async def prepare(self) -> None:
+        """Проверяет источник до отправки запроса: для пути - что файл существует (FileNotFoundError)."""
+        if self.path is not None:
+            self.__stat = await asyncio.to_thread(os.stat, self.path)
+            self.size = self.__stat.st_size
+        elif hasattr(self.source, "read") and self.replayable and self.__start is None:
+            self.__start = await asyncio.to_thread(self.source.tell)
+
+    async def cache_key(self) -> Optional[str]:
+        """
+        Ключ содержимого для кэша file_id: для пути - путь, mtime и размер,
+        для байтов - SHA-256. Потоки без чтения целиком не идентифицировать - None.
+        """
+        if self.path is not None:
+            if self.__stat is None:
+                await self.prepare()
+            return f"path:{os.path.abspath(self.path)}:{self.__stat.st_mtime_ns}:{self.__stat.st_size}"
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            if len(self.source) > DEFAULT_CHUNK_SIZE:
+                digest = await asyncio.to_thread(hashlib.sha256, self.source)
+            else:
+                digest = hashlib.sha256(self.source)
+            return f"sha256:{digest.hexdigest()}"
+        return None
+
+    def payload(self) -> Any:
+        """Тело поля формы: байты передаются как есть, остальное - потоком кусков."""
+        if isinstance(self.source, (bytes, bytearray, memoryview)):
+            return self.source
+        if not self.replayable:
+            if self.__consumed:
+                raise ValidationError(f"{self.filename!r} can be read only once")
+            self.__consumed = True
+        return self.read()
+
+    async def read(self) -> AsyncIterator[bytes]:
+        """Читает источник кусками; диск и синхронные файлы читаются в пуле потоков."""
+        if self.path is not None:
+            file = await asyncio.to_thread(open, self.path, "rb")
+            try:
+                async for chunk in self.__read_file(file):
+                    yield chunk
+            finally:
+                await asyncio.to_thread(file.close)
+        elif isinstance(self.source, (bytes, bytearray, memoryview)):
+            view = memoryview(self.source)
+            for offset in range(0, len(view), self.chunk_size):
+                yield view[offset:offset + self.chunk_size]
+        elif hasattr(self.source, "read"):
+            if self.__start is not None:
+                await asyncio.to_thread(self.source.seek, self.__start)
+            async for chunk in self.__read_file(self.source):
+                yield chunk
+        else:
+            async for chunk in self.source:
+                yield chunk
+
+    async def __read_file(self, file: BinaryIO) -> AsyncIterator[bytes]:
+        if isinstance(file, io.BytesIO):
+            # Данные уже в памяти - поток не нужен
+            while True:
+                chunk = file.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        while True:
+            chunk = await asyncio.to_thread(file.read, self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def __repr__(self) -> str:
+        return f"InputFile({self.filename!r})"
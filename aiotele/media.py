@@ -0,0 +1,133 @@
+import asyncio
+
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from . import loggers
+from .exceptions import AioTeleError, ValidationError
+from .file_cache import extract_file_id
+from .input_file import InputFile, Source
+
+MEDIA_TYPES = ("photo", "video", "audio", "document")
+MEDIA_GROUP_SIZE = (2, 10)  # Telegram принимает альбомы из 2-10 элементов
+
+
+class InputMedia:
+    """
+    Элемент альбома. Как и в send_photo, локальный файл передаётся в `file_path`
+    (путь, байты, файл, InputFile), а URL или file_id - в `url`.
+
+        InputMedia("photo", file_path="cat.jpg", caption="Cat")
+        InputMedia("video", url="https://example.com/dog.mp4")
+    """
+
+    def __init__(self, type: str = "photo", file_path: Union[Source, InputFile] = None, url: Optional[str] = None,
+                 caption: Optional[str] = None, parse_mode: Optional[str] = "HTML"):
+        if type not in MEDIA_TYPES:
+            raise ValidationError(f"Expected media type to be one of {', '.join(MEDIA_TYPES)}, got {type!r}")
+        if (file_path is None) == (url is None):
+            raise ValidationError("Pass either 'file_path' or 'url' to InputMedia")
+        if url is not None and not isinstance(url, str):
+            raise ValidationError(f"Expected 'url' to be a string, got {url.__class__.__name__}")
+        self.type = type
+        self.file = InputFile.wrap(file_path) if file_path is not None else None
+        self.url = url
+        self.caption = caption
+        self.parse_mode = parse_mode
+
+    @classmethod
+    def wrap(cls, value: Union["InputMedia", Source, InputFile]) -> "InputMedia":
+        return value if isinstance(value, InputMedia) else cls("photo", file_path=value)
+
+    def to_dict(self, media: str) -> Dict[str, Any]:
+        item = {"type": self.type, "media": media}
+        if self.caption:
+            item["caption"] = self.caption
+            if self.parse_mode:
+                item["parse_mode"] = self.parse_mode
+        return item
+
+
+async def send_photo(client, file_path: Union[Source, InputFile, None], url_photo: Optional[str], fields: Dict[str, Any],
+                     logger=loggers.event) -> bool:
+    """
+    sendPhoto для send_photo/reply_photo/answer_photo: `fields` - поля запроса с chat_id.
+    Ошибки API и отсутствующий файл пишутся в `logger`, результат - успех отправки.
+    """
+    try:
+        # Файл читается потоком во время запроса; строка (URL или file_id) уходит обычным полем
+        photo = InputFile.wrap(file_path) if file_path is not None else url_photo
+        await client.send_file("sendPhoto", "photo", photo, fields, chat_id=fields["chat_id"])
+        loggers.event.info("The photo was successfully sent.")
+        return True
+    except AioTeleError as e:
+        logger.error(f"ERROR: {e}")
+        return False
+    except FileNotFoundError:
+        logger.error(f"ERROR: File not found: {file_path}")
+        return False
+
+
+async def _pre_upload(client, item: InputMedia, chat_id: int) -> str:
+    # Отдельная отправка файла в служебный чат ради file_id; с кэшем file_id - только один раз
+    method = "send" + item.type.capitalize()
+    result = await client.send_file(method, item.type, item.file, {"chat_id": chat_id, "disable_notification": True}, chat_id=chat_id)
+    file_id = extract_file_id(result, item.type)
+    if file_id is None:
+        raise ValidationError(f"{method} returned no file_id for {item.file!r}")
+    return file_id
+
+
+async def send_media_group(client, chat_id: int, media: Iterable[Union[InputMedia, Source, InputFile]],
+                           reply_to_message_id: Optional[int] = None, upload_chat_id: Optional[int] = None) -> List[dict]:
+    """
+    Отправляет альбом одним вызовом sendMediaGroup и возвращает список сообщений.
+
+    Локальные файлы уходят в том же multipart-запросе (attach://), а уже известные
+    кэшу file_id - ссылкой. С `upload_chat_id` файлы сначала параллельно загружаются
+    в этот служебный чат (например, закрытый канал), и альбом уходит обычным JSON с file_id.
+    """
+    items = [InputMedia.wrap(item) for item in media]
+    if not MEDIA_GROUP_SIZE[0] <= len(items) <= MEDIA_GROUP_SIZE[1]:
+        raise ValidationError(f"A media group must contain {MEDIA_GROUP_SIZE[0]}-{MEDIA_GROUP_SIZE[1]} items, got {len(items)}")
+
+    refs: List[Optional[str]] = [item.url for item in items]  # URL или file_id каждого элемента
+    keys: List[Optional[str]] = [None] * len(items)  # Ключи кэша file_id для загружаемых файлов
+    local = [number for number, item in enumerate(items) if item.file is not None]
+    if upload_chat_id is not None:
+        file_ids = await asyncio.gather(*(_pre_upload(client, items[number], upload_chat_id) for number in local))
+        for number, file_id in zip(local, file_ids):
+            refs[number] = file_id
+    elif client.file_cache is not None:
+        for number in local:
+            item = items[number]
+            key = await item.file.cache_key()
+            if key is not None:
+                keys[number] = f"{item.type}:{key}"
+                refs[number] = await client.file_cache.get(keys[number], item.file.size)
+
+    files: Dict[str, InputFile] = {}
+    entries = []
+    for number, item in enumerate(items):
+        if refs[number] is not None:
+            entries.append(item.to_dict(refs[number]))
+        else:
+            name = f"file{number}"
+            files[name] = item.file
+            entries.append(item.to_dict(f"attach://{name}"))
+
+    fields = {"chat_id": chat_id, "media": entries, "reply_to_message_id": reply_to_message_id}
+    if files:
+        result = await client.call("sendMediaGroup", data=await client.multipart(fields, files), chat_id=chat_id)
+    else:
+        payload = {name: value for name, value in fields.items() if value is not None}
+        result = await client.call("sendMediaGroup", payload)
+    result = result or []
+
+    if files and client.file_cache is not None:
+        for number, message in enumerate(result):
+            if number < len(items) and keys[number] is not None and f"file{number}" in files:
+                file_id = extract_file_id(message, items[number].type)
+                if file_id is not None:
+                    await client.file_cache.set(keys[number], file_id)
+    loggers.event.info("The media group of %d items was sent.", len(items))
+    return result
@@ -0,0 +1,58 @@
+from functools import partial
+
+from typing import Any, Awaitable, Callable, Dict, List
+
+from . import loggers
+from .exceptions import ValidationError
+
+Handler = Callable[[Any, Dict[str, Any]], Awaitable[Any]]
+Middleware = Callable[[Handler, Any, Dict[str, Any]], Awaitable[Any]]
+
+
+class BaseMiddleware:
+    """
+    Базовый класс мидлвари. Мидлварь получает следующий шаг цепочки, событие и
+    словарь `data`; чтобы продолжить обработку, она вызывает `await handler(event, data)`,
+    а чтобы прервать - просто не вызывает его. Всё, что мидлварь положит в `data`,
+    передаётся хендлерам с keyword-only параметром того же имени (`async def handler(msg, *, db)`).
+
+        class Timing(BaseMiddleware):
+            async def __call__(self, handler, event, data):
+                start = time.monotonic()
+                try:
+                    return await handler(event, data)
+                finally:
+                    print(time.monotonic() - start)
+    """
+
+    async def __call__(self, handler: Handler, event: Any, data: Dict[str, Any]) -> Any:
+        return await handler(event, data)
+
+
+class MiddlewareManager:
+    """
+    Цепочка мидлварей одного уровня. `compile` один раз собирает из неё
+    вложенные вызовы; без мидлварей возвращается сам конечный обработчик,
+    поэтому пустая цепочка ничего не стоит.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.middlewares: List[Middleware] = []
+
+    def __len__(self) -> int:
+        return len(self.middlewares)
+
+    def register(self, middleware: Middleware) -> Middleware:
+        if not callable(middleware):
+            raise ValidationError(f"Expected a callable middleware, got {type(middleware).__name__}")
+        self.middlewares.append(middleware)
+        return middleware
+
+    def compile(self, handler: Handler) -> Handler:
+        # Первая зарегистрированная мидлварь - внешняя
+        for middleware in reversed(self.middlewares):
+            handler = partial(middleware, handler)
+        if self.middlewares:
+            loggers.middlewares.debug("Compiled %d %s middleware(s)", len(self.middlewares), self.name)
+        return handler
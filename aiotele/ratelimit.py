@@ -0,0 +1,117 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from typing import Dict, Iterable, Optional
+
+from .exceptions import ValidationError
+
+
+class TokenBucket:
+    """
+    Асинхронный token bucket: `rate` запросов в секунду с запасом `capacity`.
+
+    Токен резервируется сразу при вызове acquire, поэтому ожидающие
+    обслуживаются в порядке очереди без блокировок.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValidationError(f"Expected 'rate' to be a positive number, got {rate!r}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.__tokens = self.capacity
+        self.__updated = time.monotonic()
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated) * self.rate)
+        self.__updated = now
+
+    async def acquire(self) -> float:
+        """Ждёт свободный токен и возвращает время ожидания в секундах."""
+        self.__refill()
+        self.__tokens -= 1
+        if self.__tokens >= 0:
+            return 0.0
+        delay = -self.__tokens / self.rate
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.__tokens += 1  # Возвращаем неиспользованный токен
+            raise
+        return delay
+
+
+class RateLimiter:
+    """
+    Ограничитель исходящих запросов под лимиты Telegram: общий bucket на бота
+    и отдельный bucket на каждый чат (для групп - свой, более строгий лимит).
+
+    Группы и каналы определяются по отрицательному chat_id. Bucket'ы чатов
+    хранятся в LRU, поэтому память ограничена `max_chats`.
+
+    Лимиты чатов в Telegram касаются отправки сообщений, поэтому bucket чата
+    расходуют только методы с префиксами из `chat_methods` (sendMessage, copyMessage,
+    forwardMessage, ...). Удаление, редактирование и модерация ограничены только общим bucket'ом.
+    """
+
+    def __init__(self, global_rate: float = 30.0, chat_rate: float = 1.0, group_rate: float = 20 / 60,
+                 chat_burst: float = 3.0, group_burst: float = 3.0, max_chats: int = 10000,
+                 chat_methods: Iterable[str] = ("send", "copy", "forward")):
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.chat_burst = chat_burst
+        self.group_burst = group_burst
+        self.max_chats = max_chats
+        self.chat_methods = tuple(chat_methods)
+        self.__chats: "OrderedDict[int, TokenBucket]" = OrderedDict()
+
+        # Метрики
+        self.requests = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def __chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self.__chats.get(chat_id)
+        if bucket is not None:
+            self.__chats.move_to_end(chat_id)
+            return bucket
+        if chat_id < 0:
+            bucket = TokenBucket(self.group_rate, self.group_burst)
+        else:
+            bucket = TokenBucket(self.chat_rate, self.chat_burst)
+        self.__chats[chat_id] = bucket
+        if len(self.__chats) > self.max_chats:
+            self.__chats.popitem(last=False)
+        return bucket
+
+    def limits_chat(self, method: Optional[str]) -> bool:
+        """Расходует ли метод bucket чата; без имени метода - расходует, как раньше."""
+        return method is None or method.startswith(self.chat_methods)
+
+    async def acquire(self, chat_id: Optional[int] = None, method: Optional[str] = None) -> float:
+        """Ждёт разрешения на вызов `method` в чате `chat_id` и возвращает время ожидания."""
+        wait = 0.0
+        if isinstance(chat_id, int) and self.limits_chat(method):
+            wait += await self.__chat_bucket(chat_id).acquire()
+        wait += await self.global_bucket.acquire()
+
+        self.requests += 1
+        if wait:
+            self.delayed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "delayed": self.delayed,
+            "total_wait": self.total_wait,
+            "average_wait": self.total_wait / self.requests if self.requests else 0.0,
+            "max_wait": self.max_wait,
+            "tracked_chats": len(self.__chats),
+        }
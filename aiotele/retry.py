@@ -0,0 +1,39 @@
+import random
+
+from .exceptions import ValidationError
+
+# Методы, повтор которых после 5xx или обрыва соединения может продублировать сообщение
+NON_IDEMPOTENT_PREFIXES = ("send", "forward", "copy", "create", "add", "upload")
+
+
+class RetryPolicy:
+    """
+    Правила повтора запросов к Bot API.
+
+    429 повторяется для любого метода через `retry_after` секунд из ответа Telegram.
+    5xx и сетевые ошибки повторяются с экспоненциальной задержкой и full jitter,
+    но только для идемпотентных методов (или для всех, если `retry_sends=True`);
+    ошибка установки соединения повторяется всегда - запрос ещё не был отправлен.
+    Бюджет: не больше `max_attempts` попыток и `max_total_delay` секунд ожидания.
+    """
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 30.0,
+                 max_total_delay: float = 120.0, retry_sends: bool = False):
+        if not isinstance(max_attempts, int) or max_attempts < 1:
+            raise ValidationError(f"Expected 'max_attempts' to be a positive integer, got {max_attempts!r}")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_delay = max_total_delay
+        self.retry_sends = retry_sends
+
+    def is_idempotent(self, method: str) -> bool:
+        return self.retry_sends or not method.startswith(NON_IDEMPOTENT_PREFIXES)
+
+    def backoff(self, attempt: int) -> float:
+        """Задержка перед попыткой `attempt + 1`."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def allows(self, attempt: int, total_delay: float) -> bool:
+        """Можно ли сделать ещё одну попытку после `attempt` попыток и `total_delay` секунд ожидания."""
+        return attempt < self.max_attempts and total_delay <= self.max_total_delay
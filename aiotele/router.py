@@ -0,0 +1,203 @@
+import heapq
+import inspect
+from functools import lru_cache
+from types import MappingProxyType
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from .exceptions import ValidationError
+from .filters.base import EXTRACTORS, Filter
+
+
+class Route(NamedTuple):
+    handler: Callable
+    pass_command: bool  # Передавать ли CommandObject вторым аргументом
+    inject: FrozenSet[str] = frozenset()  # keyword-only параметры, заполняемые из data мидлварей
+    takes_kwargs: bool = False  # У хендлера есть **kwargs - ему передаётся вся data
+
+
+_POSITIONAL = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.VAR_POSITIONAL)
+
+
+@lru_cache(maxsize=None)
+def make_route(handler: Callable) -> Route:
+    """Сигнатура хендлера разбирается один раз, при регистрации."""
+    try:
+        params = inspect.signature(handler).parameters.values()
+    except (TypeError, ValueError):
+        return Route(handler, True)
+    positional = sum(1 for param in params if param.kind in _POSITIONAL)
+    inject = frozenset(param.name for param in params if param.kind is inspect.Parameter.KEYWORD_ONLY)
+    takes_kwargs = any(param.kind is inspect.Parameter.VAR_KEYWORD for param in params)
+    return Route(handler, positional != 1, inject, takes_kwargs)
+
+
+class CommandRouter:
+    """
+    Таблица команд текстовых сообщений.
+
+    Регистрации (команда, алиасы, префиксы) компилируются в неизменяемый словарь
+    вида {"/start": Route, "/start@botname": Route, ...}, поэтому поиск хендлера
+    для сообщения - один поиск в словаре по первому слову текста.
+    """
+
+    def __init__(self):
+        self.__registrations: List[tuple] = []  # (имена, префиксы, Route) в порядке регистрации
+        self.__table: Mapping[str, Route] = MappingProxyType({})
+        self.__compiled = False
+        self.bot_username: Optional[str] = None
+        self.default: Optional[Route] = None  # Хендлер для любого сообщения
+
+    def register(self, handler: Callable, names: Iterable[str], prefixes: Optional[Iterable[str]] = None) -> None:
+        names = tuple(names)
+        for name in names:
+            if not isinstance(name, str) or not name:
+                raise ValidationError(f"Expected command to be a non-empty string, got {name!r}")
+        self.__registrations.append((names, tuple(prefixes) if prefixes else ("",), make_route(handler)))
+        self.__compiled = False
+
+    def set_default(self, handler: Callable) -> None:
+        self.default = make_route(handler)
+
+    def compile(self, bot_username: Optional[str] = None) -> Mapping[str, Route]:
+        """Собирает таблицу. `bot_username` добавляет варианты команд вида /start@botname."""
+        if bot_username is not None:
+            self.bot_username = bot_username
+        table: Dict[str, Route] = {}
+        for names, prefixes, route in self.__registrations:
+            for name in names:
+                for prefix in prefixes:
+                    key = prefix + name
+                    # Более поздняя регистрация перекрывает раннюю, как и раньше
+                    table[key] = route
+                    if self.bot_username:
+                        table[f"{key}@{self.bot_username}"] = route
+                        table[f"{key}@{self.bot_username.lower()}"] = route
+        self.__table = MappingProxyType(table)
+        self.__compiled = True
+        return self.__table
+
+    @property
+    def table(self) -> Mapping[str, Route]:
+        if not self.__compiled:
+            self.compile()
+        return self.__table
+
+    def lookup(self, text: str) -> Optional[Route]:
+        """Хендлер команды из первого слова текста, без учёта общего хендлера."""
+        if not self.__compiled:
+            self.compile()
+        parts = text.split(None, 1)
+        return self.__table.get(parts[0]) if parts else None
+
+    def resolve(self, text: str) -> Optional[Route]:
+        route = self.lookup(text)
+        return route if route is not None else self.default
+
+
+class FilterRouter:
+    """
+    Хендлеры с фильтрами. Побеждает первый зарегистрированный хендлер, чей фильтр прошёл.
+
+    Хендлеры раскладываются по корзинам по самому дешёвому индексируемому фильтру
+    (тип чата, точный текст, команда, ...), поэтому для апдейта проверяются только
+    хендлеры из подходящих корзин и хендлеры без индекса.
+    """
+
+    def __init__(self):
+        self.__routes: List[Tuple[Filter, Route]] = []
+        self.__index: Dict[str, Dict[Any, Tuple[int, ...]]] = {}  # {измерение: {значение: номера хендлеров}}
+        self.__unindexed: Tuple[int, ...] = ()
+        self.__compiled = False
+        self.bot_username: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self.__routes)
+
+    def register(self, handler: Callable, rule: Filter) -> None:
+        if not isinstance(rule, Filter):
+            raise ValidationError(f"Expected a Filter, got {type(rule).__name__}")
+        self.__routes.append((rule, make_route(handler)))
+        self.__compiled = False
+
+    def compile(self, bot_username: Optional[str] = None) -> None:
+        """Раскладывает хендлеры по корзинам; `bot_username` передаётся фильтрам через `bind`."""
+        if bot_username is not None:
+            self.bot_username = bot_username
+        index: Dict[str, Dict[Any, List[int]]] = {}
+        unindexed: List[int] = []
+        for number, (rule, _) in enumerate(self.__routes):
+            rule.bind(self.bot_username)
+            key = rule.index_key()
+            if key is None or key[0] not in EXTRACTORS:
+                unindexed.append(number)
+                continue
+            dimension, values = key
+            buckets = index.setdefault(dimension, {})
+            for value in values:
+                buckets.setdefault(value, []).append(number)
+        self.__index = {
+            dimension: {value: tuple(numbers) for value, numbers in buckets.items()}
+            for dimension, buckets in index.items()
+        }
+        self.__unindexed = tuple(unindexed)
+        self.__compiled = True
+
+    def candidates(self, event: dict) -> Iterable[int]:
+        """Номера хендлеров, которые стоит проверить, в порядке регистрации."""
+        if not self.__compiled:
+            self.compile()
+        groups = [self.__unindexed] if self.__unindexed else []
+        for dimension, buckets in self.__index.items():
+            numbers = buckets.get(EXTRACTORS[dimension](event))
+            if numbers:
+                groups.append(numbers)
+        if len(groups) == 1:
+            return groups[0]
+        return heapq.merge(*groups)
+
+    def resolve(self, event: dict) -> Optional[Route]:
+        if not self.__routes:
+            return None
+        for number in self.candidates(event):
+            rule, route = self.__routes[number]
+            if rule.check(event):
+                return route
+        return None
+
+
+class PrefixTrie:
+    """
+    Префиксное дерево строк. `match` за один проход по строке возвращает
+    значения всех зарегистрированных префиксов - от самого длинного к короткому.
+    """
+
+    def __init__(self):
+        self.__root: dict = {}  # {символ: узел, None: значения префикса, заканчивающегося в узле}
+        self.__size = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def insert(self, prefix: str, value: Any) -> None:
+        node = self.__root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append(value)
+        self.__size += 1
+
+    def match(self, key: str) -> List[Any]:
+        found = []
+        node = self.__root
+        if None in node:
+            found.append(node[None])
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                found.append(node[None])
+        result = []
+        for values in reversed(found):
+            result.extend(values)
+        return result
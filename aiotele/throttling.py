@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections import deque
+
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+from . import loggers
+from .cache import TTLCache
+from .exceptions import TelegramAPIError, TelegramNetworkError, ValidationError
+from .filters.base import get_chat
+from .middlewares import BaseMiddleware, Handler
+from .types import Update
+
+THROTTLING_ACTIONS = ("drop", "warn", "delay")
+
+KEYS: Dict[str, Callable[[dict], Hashable]] = {
+    "user": lambda event: event.get("from", {}).get("id"),
+    "chat": lambda event: get_chat(event).get("id"),
+    "user_chat": lambda event: (get_chat(event).get("id"), event.get("from", {}).get("id")),
+}
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Антифлуд: не больше `rate` апдейтов от одного пользователя (или чата) за
+    скользящее окно в `period` секунд. Лишние апдейты не доходят до роутинга.
+
+    `action`:
+        "drop"  - апдейт молча отбрасывается;
+        "warn"  - отбрасывается, а при первом превышении в серии пользователю
+                  один раз отправляется `warning`;
+        "delay" - обработка откладывается до освобождения окна, но не дольше
+                  `max_delay` секунд, иначе апдейт отбрасывается. Отложенный
+                  апдейт занимает воркер диспетчера.
+
+    Окна хранятся в TTLCache: ключи без активности дольше окна удаляются,
+    а всего хранится не больше `max_size` ключей.
+    """
+
+    def __init__(self, rate: int = 5, period: float = 1.0, action: str = "drop",
+                 key: Union[str, Callable[[dict], Hashable]] = "user", warning: str = "Too many requests, slow down.",
+                 max_delay: Optional[float] = None, max_size: int = 100000, client=None):
+        if not isinstance(rate, int) or rate < 1:
+            raise ValidationError(f"Expected 'rate' to be a positive integer, got {rate!r}")
+        if period <= 0:
+            raise ValidationError(f"Expected 'period' to be a positive number, got {period!r}")
+        if action not in THROTTLING_ACTIONS:
+            raise ValidationError(f"Expected 'action' to be one of {', '.join(THROTTLING_ACTIONS)}, got {action!r}")
+        if action == "warn" and client is None:
+            raise ValidationError("Throttling action 'warn' needs a client to send the warning")
+        if isinstance(key, str):
+            if key not in KEYS:
+                raise ValidationError(f"Expected 'key' to be one of {', '.join(KEYS)} or a callable, got {key!r}")
+            key = KEYS[key]
+        self.rate = rate
+        self.period = period
+        self.action = action
+        self.key = key
+        self.warning = warning
+        self.max_delay = period if max_delay is None else max_delay
+        self.client = client
+        # В режиме delay окно хранит и будущие слоты, поэтому живёт дольше
+        ttl = period + self.max_delay if action == "delay" else period
+        self.__windows = TTLCache(maxsize=max_size, ttl=ttl)  # {ключ: время последних `rate` апдейтов}
+        self.__warned = TTLCache(maxsize=max_size, ttl=period)  # Ключи, уже получившие предупреждение
+
+        # Метрики
+        self.passed = 0
+        self.dropped = 0
+        self.delayed = 0
+
+    def __len__(self) -> int:
+        return len(self.__windows)
+
+    def __reserve(self, key: Hashable) -> float:
+        """Занимает слот в окне ключа; возвращает, сколько секунд ждать слота, или -1, если ждать нельзя."""
+        now = time.monotonic()
+        window = self.__windows.get(key)
+        if window is None:
+            window = deque(maxlen=self.rate)
+        self.__windows.set(key, window)
+        if len(window) < self.rate or window[0] + self.period <= now:
+            window.append(now)
+            return 0.0
+        if self.action != "delay":
+            return -1.0
+        # Слот освобождается, когда самый старый апдейт выйдет из окна
+        slot = window[0] + self.period
+        if slot - now > self.max_delay:
+            return -1.0
+        window.append(slot)
+        return slot - now
+
+    async def __warn(self, key: Hashable, update: Update) -> None:
+        # Пока флуд продолжается, метка продлевается - предупреждение уходит один раз на серию
+        warned = key in self.__warned
+        self.__warned.set(key, True)
+        if warned:
+            return
+        event = update.event
+        try:
+            if update.type == "callback_query":
+                await self.client.call("answerCallbackQuery", {"callback_query_id": event["id"], "text": self.warning})
+            else:
+                chat_id = get_chat(event).get("id") or event.get("from", {}).get("id")
+                if chat_id is not None:
+                    await self.client.call("sendMessage", {"chat_id": chat_id, "text": self.warning}, chat_id=chat_id)
+        except (TelegramAPIError, TelegramNetworkError) as e:
+            loggers.middlewares.warning("Failed to send throttling warning to %s: %s", key, e)
+
+    async def __call__(self, handler: Handler, event: Any, data: Dict[str, Any]) -> Any:
+        update = Update(event)
+        key = self.key(update.event) if isinstance(update.event, dict) else None
+        if key is None or key == (None, None):
+            return await handler(event, data)
+        wait = self.__reserve(key)
+        if wait < 0:
+            self.dropped += 1
+            loggers.middlewares.debug("Throttled %s update from %s", update.type, key)
+            if self.action == "warn":
+                await self.__warn(key, update)
+            return None
+        if wait > 0:
+            self.delayed += 1
+            await asyncio.sleep(wait)
+        self.passed += 1
+        return await handler(event, data)
@@ -1,5 +1,3 @@
-import ssl
-import certifi
 import aiohttp
 
 import logging
@@ -9,56 +7,178 @@ from . import loggers
 
 from typing import List, Dict, Union, Optional
 from .exceptions import *
+from .client import TelegramClient
+from .input_file import InputFile, Source
+from .media import InputMedia, send_media_group, send_photo
 
 logging.basicConfig(level=logging.INFO)
 
+class lazy_property:
+    """
+    Свойство, которое вычисляется при первом обращении и сохраняется в слот `_lazy_<имя>`.
+    Объекты апдейтов не разбирают вложенные словари, пока хендлер к ним не обратится.
+    """
+
+    __slots__ = ("func", "slot")
+
+    def __init__(self, func):
+        self.func = func
+        self.slot = f"_lazy_{func.__name__}"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value = self.func(instance)
+            setattr(instance, self.slot, value)
+            return value
+
+
+class _ApiObject:
+    """
+    Объект апдейта с методами Bot API. Использует общий пул соединений бота;
+    собственный клиент создаётся, только если объект собран вручную.
+    """
+
+    __slots__ = ("_client", "_own_client")
+
+    def _bind_client(self, token: str, client: Optional[TelegramClient]) -> None:
+        self._own_client = client is None
+        self._client = client if client is not None else TelegramClient(token)
+
+    async def start_session(self):
+        await self._client.start_session()
+
+    async def close_session(self):
+        # Общую сессию бота не закрываем
+        if self._own_client:
+            await self._client.close_session()
+
+
 class Entities:
+    __slots__ = ("__raw", "_lazy_from_user")
+
     def __init__(self, obj):
-        self.type = obj.get("type", None)
-        self.offset = obj.get("offset", None)
-        self.length = obj.get("length", None)
-        self.__user = obj.get("user", None)
-        self.from_user = From_user(user_id=self.__user.get("id", None), fullname=self.__user.get("first_name", None), username=self.__user.get("username", None), language_code=self.__user.get("language_code", None), is_bot=self.__user.get("is_bot", None))
+        self.__raw = obj
+
+    @property
+    def type(self) -> str:
+        return self.__raw.get("type")
+
+    @property
+    def offset(self) -> int:
+        return self.__raw.get("offset")
+
+    @property
+    def length(self) -> int:
+        return self.__raw.get("length")
+
+    @lazy_property
+    def from_user(self) -> Optional["From_user"]:
+        user = self.__raw.get("user")
+        return From_user.from_dict(user) if user is not None else None
 
 class From_user:
+    __slots__ = ("__raw",)
+
     def __init__(self, fullname: str, user_id: int, username: str, is_bot: bool, language_code: str):
-        self.full_name = fullname
-        self.id = user_id
-        self.username = username
-        self.is_bot = is_bot
-        self.language_code = language_code
+        self.__raw = {"id": user_id, "first_name": fullname, "username": username, "is_bot": is_bot, "language_code": language_code}
+
+    @classmethod
+    def from_dict(cls, obj: dict) -> "From_user":
+        """Обёртка над объектом User из апдейта, без копирования полей."""
+        self = cls.__new__(cls)
+        self.__raw = obj
+        return self
+
+    @property
+    def full_name(self) -> str:
+        first_name = self.__raw.get("first_name")
+        last_name = self.__raw.get("last_name")
+        return f"{first_name} {last_name}" if first_name and last_name else first_name
+
+    @property
+    def id(self) -> int:
+        return self.__raw.get("id")
+
+    @property
+    def username(self) -> str:
+        return self.__raw.get("username")
+
+    @property
+    def is_bot(self) -> bool:
+        return self.__raw.get("is_bot")
+
+    @property
+    def language_code(self) -> str:
+        return self.__raw.get("language_code")
     
 class Chat:
+    __slots__ = ("__raw",)
+
     def __init__(self, chat_id: int, title: str, username: str, _type: str):
-        self.id = id
-        self.title = title
-        self.username = username
-        self.type = _type
+        self.__raw = {"id": chat_id, "title": title, "username": username, "type": _type}
+
+    @classmethod
+    def from_dict(cls, obj: dict) -> "Chat":
+        self = cls.__new__(cls)
+        self.__raw = obj
+        return self
+
+    @property
+    def id(self) -> int:
+        return self.__raw.get("id")
+
+    @property
+    def title(self) -> str:
+        return self.__raw.get("title")
+
+    @property
+    def username(self) -> str:
+        return self.__raw.get("username")
+
+    @property
+    def type(self) -> str:
+        return self.__raw.get("type")
+
+class Reply_to_message(_ApiObject):
+    __slots__ = ("__raw", "__chat_id", "__token", "_lazy_from_user")
 
-class Reply_to_message:
     def __init__(self, full_name: str, user_id: int, message_id: int, username: str, is_bot: bool, language_code: str,
-                 token: str, chat_id: int):
-        self.__token = token
-        self.__url = f"https://api.telegram.org/bot{self.__token}/"
-        self.full_name = full_name
-        self.user_id = user_id
-        self.message_id = message_id
-        
+                 token: str, chat_id: int, client: TelegramClient=None):
+        raw = {"message_id": message_id, "from": {"id": user_id, "first_name": full_name, "username": username,
+                                                  "is_bot": is_bot, "language_code": language_code}}
+        self.__setup(raw, chat_id, token, client)
+
+    @classmethod
+    def from_dict(cls, obj: dict, chat_id: int, token: str, client: TelegramClient=None) -> "Reply_to_message":
+        self = cls.__new__(cls)
+        self.__setup(obj, chat_id, token, client)
+        return self
+
+    def __setup(self, obj: dict, chat_id: int, token: str, client: Optional[TelegramClient]) -> None:
+        self.__raw = obj
         self.__chat_id = chat_id
-        
-        self.from_user = From_user(fullname=full_name, user_id=user_id, username=username, is_bot=is_bot, language_code=language_code)
-        
-        self.session = None
-        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
-    
-    async def start_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=self.ssl_context))
+        self.__token = token
+        self._bind_client(self.__token, client)
 
-    async def close_session(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
+    @property
+    def message_id(self) -> int:
+        return self.__raw.get("message_id")
+
+    @lazy_property
+    def from_user(self) -> From_user:
+        return From_user.from_dict(self.__raw.get("from", {}))
+
+    @property
+    def full_name(self) -> str:
+        return self.from_user.full_name
+
+    @property
+    def user_id(self) -> int:
+        return self.from_user.id
     
     async def delete_message(self) -> bool:
         await self.start_session()
@@ -67,13 +187,9 @@ class Reply_to_message:
             "message_id": self.message_id,
         }
         try:
-            async with self.session.post(self.__url + "deleteMessage", json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return True
-                else:
-                    raise TelegramBadRequest((await response.json()).get("description"))
-        except Exception as e:
+            await self._client.call("deleteMessage", payload)
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
@@ -102,87 +218,61 @@ class Reply_to_message:
             payload["reply_markup"] = reply_markup
 
         try:
-            async with self.session.post(self.__url + "sendMessage", json=payload) as response:
-                response.raise_for_status()
-                data = await response.json()
-                loggers.event.info("The message has been sent successfully.")
-                return True
-        except Exception as e:
+            await self._client.call("sendMessage", payload)
+            loggers.event.info("The message has been sent successfully.")
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
             await self.close_session()
     
-    async def reply_photo(self, file_path: str=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
+    async def reply_photo(self, file_path: Union[Source, InputFile]=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
             raise ValueError("The 'parse_mode' parameter cannot be None or not a string.")
         
-        if not isinstance(url_photo, str):
+        if file_path is None and not isinstance(url_photo, str):
             raise ValueError("The 'url_photo' parameter cannot be None or not a string.")
         await self.start_session()
         
         try:
-            if file_path:
-                # Чтение файла и создание FormData
-                with open(file_path, "rb") as photo_file:
-                    form_data = aiohttp.FormData()
-                    form_data.add_field("chat_id", str(self.__chat_id))
-                    form_data.add_field("photo", photo_file, filename=file_path.split("/")[-1])
-                    form_data.add_field("parse_mode", parse_mode)
-                    form_data.add_field("reply_to_message_id", self.message_id)
-            else:
-                form_data = aiohttp.FormData()
-                form_data.add_field("chat_id", str(self.__chat_id))
-                form_data.add_field("photo", url_photo)
-                form_data.add_field("parse_mode", parse_mode)
-                form_data.add_field("reply_to_message_id", self.message_id)
-
-            if caption:
-                form_data.add_field("caption", caption)
-
-            if reply_markup:
-                form_data.add_field("reply_markup", reply_markup)
-                
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}sendPhoto", data=form_data) as response:
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.event.info("The photo was successfully sent.")
-                data = await response.json()
-                await self.close_session()
-                return True
-        
-        except aiohttp.ClientError as e:
-            loggers.event.error(f"ERROR: {e}")
-            return False
-        
-        except FileNotFoundError:
-            loggers.event.error(f"ERROR: File not found: {file_path}")
-            return False
+            return await send_photo(self._client, file_path, url_photo, {
+                "chat_id": self.__chat_id,
+                "parse_mode": parse_mode,
+                "caption": caption or None,
+                "reply_markup": reply_markup or None,
+                "reply_to_message_id": self.message_id,
+            })
+        finally:
+            await self.close_session()
 
-class NewChatMember:
-    def __init__(self, new_member, old_member, chat, message_id: int, token: str):
-        if new_member.get("id", None) != old_member.get("id", None):
-            self.old_member = From_user(user_id=old_member.get("id", None), fullname=old_member.get("first_name", None), username=old_member.get("username", None), is_bot=old_member.get("is_bot", None), language_code=old_member.get("language_code", None))
-        else:
-            self.old_member = None
-        self.new_member = From_user(user_id=new_member.get("id", None), fullname=new_member.get("first_name", None), username=new_member.get("username", None), is_bot=new_member.get("is_bot", None), language_code=new_member.get("language_code", None))
-        self.chat = Chat(chat_id=chat.get("id", None), title=chat.get("title", None), username=chat.get("username", None), _type=chat.get("type", None))
+class NewChatMember(_ApiObject):
+    __slots__ = ("__new_member", "__old_member", "__chat", "__chat_id", "message_id", "__token",
+                 "_lazy_new_member", "_lazy_old_member", "_lazy_chat")
+
+    def __init__(self, new_member, old_member, chat, message_id: int, token: str, client: TelegramClient=None):
+        self.__new_member = new_member
+        self.__old_member = old_member
+        self.__chat = chat
         self.__chat_id = chat.get("id", None)
         self.message_id = message_id
         self.__token = token
-        self.__url = f"https://api.telegram.org/bot{self.__token}/"
-        
-        self.session = None
-        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
-    
-    async def start_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=self.ssl_context))
-
-    async def close_session(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
+        self._bind_client(self.__token, client)
+
+    @lazy_property
+    def new_member(self) -> From_user:
+        return From_user.from_dict(self.__new_member)
+
+    @lazy_property
+    def old_member(self) -> Optional[From_user]:
+        # Пользователь пришёл сам - добавившего нет
+        if self.__new_member.get("id", None) == self.__old_member.get("id", None):
+            return None
+        return From_user.from_dict(self.__old_member)
+
+    @lazy_property
+    def chat(self) -> Chat:
+        return Chat.from_dict(self.__chat)
     
     async def answer(self, message: str, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
@@ -205,12 +295,10 @@ class NewChatMember:
         print(payload)
         
         try:
-            async with self.session.post(self.__url + "sendMessage", json=payload) as response:
-                response.raise_for_status()  # Бросает исключение для HTTP-ошибок
-                data = await response.json()
-                loggers.event.info("The message has been sent successfully.")
-                return True
-        except Exception as e:
+            await self._client.call("sendMessage", payload)
+            loggers.event.info("The message has been sent successfully.")
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
@@ -239,12 +327,10 @@ class NewChatMember:
             payload["reply_markup"] = reply_markup
 
         try:
-            async with self.session.post(self.__url + "sendMessage", json=payload) as response:
-                response.raise_for_status()
-                data = await response.json()
-                loggers.event.info("The message has been sent successfully.")
-                return True
-        except Exception as e:
+            await self._client.call("sendMessage", payload)
+            loggers.event.info("The message has been sent successfully.")
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
@@ -257,142 +343,106 @@ class NewChatMember:
             "message_id": self.message_id,
         }
         try:
-            async with self.session.post(self.__url + "deleteMessage", json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return True
-                else:
-                    raise TelegramBadRequest((await response.json()).get("description"))
-        except Exception as e:
+            await self._client.call("deleteMessage", payload)
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
             await self.close_session()
     
-    async def reply_photo(self, file_path: str=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
+    async def reply_photo(self, file_path: Union[Source, InputFile]=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
             raise ValueError("The 'parse_mode' parameter cannot be None or not a string.")
 
-        if not isinstance(url_photo, str):
+        if file_path is None and not isinstance(url_photo, str):
             raise ValueError("The 'url_photo' parameter cannot be None or not a string.")
         await self.start_session()
         
         try:
-            if file_path:
-                # Чтение файла и создание FormData
-                with open(file_path, "rb") as photo_file:
-                    form_data = aiohttp.FormData()
-                    form_data.add_field("chat_id", str(self.__chat_id))
-                    form_data.add_field("photo", photo_file, filename=file_path.split("/")[-1])
-                    form_data.add_field("parse_mode", parse_mode)
-                    form_data.add_field("reply_to_message_id", self.message_id)
-            else:
-                form_data = aiohttp.FormData()
-                form_data.add_field("chat_id", str(self.__chat_id))
-                form_data.add_field("photo", url_photo)
-                form_data.add_field("parse_mode", parse_mode)
-                form_data.add_field("reply_to_message_id", self.message_id)
-
-            if caption:
-                form_data.add_field("caption", caption)
-
-            if reply_markup:
-                form_data.add_field("reply_markup", reply_markup)
-                
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}sendPhoto", data=form_data) as response:
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.event.info("The photo was successfully sent.")
-                data = await response.json()
-                await self.close_session()
-                return True
-        
-        except aiohttp.ClientError as e:
-            loggers.event.error(f"ERROR: {e}")
-            return False
-        
-        except FileNotFoundError:
-            loggers.event.error(f"ERROR: File not found: {file_path}")
-            return False
+            return await send_photo(self._client, file_path, url_photo, {
+                "chat_id": self.__chat_id,
+                "parse_mode": parse_mode,
+                "caption": caption or None,
+                "reply_markup": reply_markup or None,
+                "reply_to_message_id": self.message_id,
+            })
+        finally:
+            await self.close_session()
     
-    async def answer_photo(self, file_path: str=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
+    async def answer_photo(self, file_path: Union[Source, InputFile]=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
             loggers.event.error(f"Expected 'parse_mode' to be a string, got {type(parse_mode).__name__}")
             return False
 
-        if not isinstance(url_photo, str):
+        if file_path is None and not isinstance(url_photo, str):
             loggers.event.error(f"Expected 'url_photo' to be a string, got {type(url_photo).__name__}")
             return False
         await self.start_session()
         
         try:
-            if file_path:
-                # Чтение файла и создание FormData
-                with open(file_path, "rb") as photo_file:
-                    form_data = aiohttp.FormData()
-                    form_data.add_field("chat_id", str(self.__chat_id))
-                    form_data.add_field("photo", photo_file, filename=file_path.split("/")[-1])
-                    form_data.add_field("parse_mode", parse_mode)
-            else:
-                form_data = aiohttp.FormData()
-                form_data.add_field("chat_id", str(self.__chat_id))
-                form_data.add_field("photo", url_photo)
-                form_data.add_field("parse_mode", parse_mode)
-
-            if caption:
-                form_data.add_field("caption", caption)
-
-            if reply_markup:
-                form_data.add_field("reply_markup", reply_markup)
-            
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}sendPhoto", data=form_data) as response:
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.event.info("The photo was successfully sent.")
-                data = await response.json()
-                await self.close_session()
-                return True
-        
-        except aiohttp.ClientError as e:
-            loggers.bot.error(f"ERROR: {e}")
-            return False
-        
-        except FileNotFoundError:
-            loggers.bot.error(f"ERROR: File not found: {file_path}")
-            return False
+            return await send_photo(self._client, file_path, url_photo, {
+                "chat_id": self.__chat_id,
+                "parse_mode": parse_mode,
+                "caption": caption or None,
+                "reply_markup": reply_markup or None,
+            }, logger=loggers.bot)
+        finally:
+            await self.close_session()
 
-class LeaveChatMember:
-    def __init__(self, leave_member, administrator, chat, message_id: int, token: str):
-        class LeaveMember:
-            def __init__(self, user_id: int, username: str, full_name: str, is_bot: bool, language_code: str):
-                self.user_id = user_id
-                self.username = username
-                self.full_name = full_name
-                self.is_bot = is_bot
-                self.language_code = language_code
-        
-        if leave_member.get("id", None) != administrator.get("id", None):
-            self.from_user = From_user(user_id=administrator.get("id", None), fullname=administrator.get("first_name", None), username=administrator.get("username", None), is_bot=administrator.get("is_bot", None), language_code=administrator.get("language_code", None))
-        else:
-            self.from_user = From_user(user_id=None, fullname=None, username=None, is_bot=None, language_code=None)
-        self.leave_member = LeaveMember(leave_member.get("id", None), leave_member.get("username", None), leave_member.get("first_name", None), leave_member.get("is_bot", None), leave_member.get("language_code", None))
-        self.chat = Chat(chat_id=chat.get("id", None), title=chat.get("title", None), username=chat.get("username", None), _type=chat.get("type", None))
+class LeaveMember:
+    __slots__ = ("__raw",)
+
+    def __init__(self, obj: dict):
+        self.__raw = obj
+
+    @property
+    def user_id(self) -> int:
+        return self.__raw.get("id")
+
+    @property
+    def username(self) -> str:
+        return self.__raw.get("username")
+
+    @property
+    def full_name(self) -> str:
+        return self.__raw.get("first_name")
+
+    @property
+    def is_bot(self) -> bool:
+        return self.__raw.get("is_bot")
+
+    @property
+    def language_code(self) -> str:
+        return self.__raw.get("language_code")
+
+class LeaveChatMember(_ApiObject):
+    __slots__ = ("__leave_member", "__administrator", "__chat", "__chat_id", "message_id", "__token",
+                 "_lazy_from_user", "_lazy_leave_member", "_lazy_chat")
+
+    def __init__(self, leave_member, administrator, chat, message_id: int, token: str, client: TelegramClient=None):
+        self.__leave_member = leave_member
+        self.__administrator = administrator
+        self.__chat = chat
         self.__chat_id = chat.get("id", None)
         self.message_id = message_id
         self.__token = token
-        self.__url = f"https://api.telegram.org/bot{self.__token}/"
-        
-        self.session = None
-        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
-    
-    async def start_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=self.ssl_context))
-
-    async def close_session(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
+        self._bind_client(self.__token, client)
+
+    @lazy_property
+    def from_user(self) -> From_user:
+        # Пользователь вышел сам - удалившего нет
+        if self.__leave_member.get("id", None) == self.__administrator.get("id", None):
+            return From_user(user_id=None, fullname=None, username=None, is_bot=None, language_code=None)
+        return From_user.from_dict(self.__administrator)
+
+    @lazy_property
+    def leave_member(self) -> LeaveMember:
+        return LeaveMember(self.__leave_member)
+
+    @lazy_property
+    def chat(self) -> Chat:
+        return Chat.from_dict(self.__chat)
     
     async def answer(self, message: str, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
@@ -413,12 +463,10 @@ class LeaveChatMember:
             payload["reply_markup"] = reply_markup
         
         try:
-            async with self.session.post(self.__url + "sendMessage", json=payload) as response:
-                response.raise_for_status()  # Бросает исключение для HTTP-ошибок
-                data = await response.json()
-                loggers.event.info("The message has been sent successfully.")
-                return True
-        except Exception as e:
+            await self._client.call("sendMessage", payload)
+            loggers.event.info("The message has been sent successfully.")
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
@@ -447,12 +495,10 @@ class LeaveChatMember:
             payload["reply_markup"] = reply_markup
 
         try:
-            async with self.session.post(self.__url + "sendMessage", json=payload) as response:
-                response.raise_for_status()
-                data = await response.json()
-                loggers.event.info("The message has been sent successfully.")
-                return True
-        except Exception as e:
+            await self._client.call("sendMessage", payload)
+            loggers.event.info("The message has been sent successfully.")
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
@@ -465,141 +511,134 @@ class LeaveChatMember:
             "message_id": self.message_id,
         }
         try:
-            async with self.session.post(self.__url + "deleteMessage", json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return True
-                else:
-                    raise TelegramBadRequest((await response.json()).get("description"))
-        except Exception as e:
+            await self._client.call("deleteMessage", payload)
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
             await self.close_session()
     
-    async def reply_photo(self, file_path: str=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
+    async def reply_photo(self, file_path: Union[Source, InputFile]=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
             raise ValueError("The 'parse_mode' parameter cannot be None or not a string.")
 
-        if not isinstance(url_photo, str):
+        if file_path is None and not isinstance(url_photo, str):
             raise ValueError("The 'url_photo' parameter cannot be None or not a string.")
         await self.start_session()
         
         try:
-            if file_path:
-                # Чтение файла и создание FormData
-                with open(file_path, "rb") as photo_file:
-                    form_data = aiohttp.FormData()
-                    form_data.add_field("chat_id", str(self.__chat_id))
-                    form_data.add_field("photo", photo_file, filename=file_path.split("/")[-1])
-                    form_data.add_field("parse_mode", parse_mode)
-                    form_data.add_field("reply_to_message_id", self.message_id)
-            else:
-                form_data = aiohttp.FormData()
-                form_data.add_field("chat_id", str(self.__chat_id))
-                form_data.add_field("photo", url_photo)
-                form_data.add_field("parse_mode", parse_mode)
-                form_data.add_field("reply_to_message_id", self.message_id)
-
-            if caption:
-                form_data.add_field("caption", caption)
-
-            if reply_markup:
-                form_data.add_field("reply_markup", reply_markup)
-                
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}sendPhoto", data=form_data) as response:
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.event.info("The photo was successfully sent.")
-                data = await response.json()
-                await self.close_session()
-                return True
-        
-        except aiohttp.ClientError as e:
-            loggers.event.error(f"ERROR: {e}")
-            return False
-        
-        except FileNotFoundError:
-            loggers.event.error(f"ERROR: File not found: {file_path}")
-            return False
+            return await send_photo(self._client, file_path, url_photo, {
+                "chat_id": self.__chat_id,
+                "parse_mode": parse_mode,
+                "caption": caption or None,
+                "reply_markup": reply_markup or None,
+                "reply_to_message_id": self.message_id,
+            })
+        finally:
+            await self.close_session()
     
-    async def answer_photo(self, file_path: str=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
+    async def answer_photo(self, file_path: Union[Source, InputFile]=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
             loggers.event.error(f"Expected 'parse_mode' to be a string, got {type(parse_mode).__name__}")
             return False
 
-        if not isinstance(url_photo, str):
+        if file_path is None and not isinstance(url_photo, str):
             loggers.event.error(f"Expected 'url_photo' to be a string, got {type(url_photo).__name__}")
             return False
         await self.start_session()
         
         try:
-            if file_path:
-                # Чтение файла и создание FormData
-                with open(file_path, "rb") as photo_file:
-                    form_data = aiohttp.FormData()
-                    form_data.add_field("chat_id", str(self.__chat_id))
-                    form_data.add_field("photo", photo_file, filename=file_path.split("/")[-1])
-                    form_data.add_field("parse_mode", parse_mode)
-            else:
-                form_data = aiohttp.FormData()
-                form_data.add_field("chat_id", str(self.__chat_id))
-                form_data.add_field("photo", url_photo)
-                form_data.add_field("parse_mode", parse_mode)
-
-            if caption:
-                form_data.add_field("caption", caption)
-
-            if reply_markup:
-                form_data.add_field("reply_markup", reply_markup)
-            
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}sendPhoto", data=form_data) as response:
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.event.info("The photo was successfully sent.")
-                data = await response.json()
-                await self.close_session()
-                return True
-        
-        except aiohttp.ClientError as e:
-            loggers.bot.error(f"ERROR: {e}")
-            return False
-        
-        except FileNotFoundError:
-            loggers.bot.error(f"ERROR: File not found: {file_path}")
-            return False
+            return await send_photo(self._client, file_path, url_photo, {
+                "chat_id": self.__chat_id,
+                "parse_mode": parse_mode,
+                "caption": caption or None,
+                "reply_markup": reply_markup or None,
+            }, logger=loggers.bot)
+        finally:
+            await self.close_session()
+
+class MessageObject(_ApiObject):
+    """
+    Сообщение. Обёртка над словарём Message из апдейта: поля читаются из него
+    при обращении, from_user/chat/reply_to_message создаются при первом доступе.
+    """
+
+    __slots__ = ("__raw", "__token", "_lazy_from_user", "_lazy_chat", "_lazy_reply_to_message")
 
-class MessageObject:
     def __init__(self, chat_id: int, message_id: int, fullname: str, user_id: int, username: str, is_bot: bool,
                  token: str, type_chat: str, title: str, chat_username: str, message_text: str,
                  reply_to_message_fullname: str=None, reply_to_message_user_id: int=None, reply_to_message_message_id: int=None, reply_is_bot: bool=None,
-                 language_code: str=None, reply_language_code: str=None):
-        self.__chat_id = chat_id
-        
-        self.message_id = message_id
-        self.text = message_text
-        self.__type = type_chat
+                 language_code: str=None, reply_language_code: str=None, client: TelegramClient=None):
+        raw = {
+            "message_id": message_id,
+            "text": message_text,
+            "from": {"id": user_id, "first_name": fullname, "username": username, "is_bot": is_bot, "language_code": language_code},
+            "chat": {"id": chat_id, "type": type_chat, "title": title, "username": chat_username},
+        }
         if reply_to_message_message_id:
-            self.reply_to_message = Reply_to_message(full_name=reply_to_message_fullname, user_id=reply_to_message_user_id, message_id=reply_to_message_message_id, username=username, is_bot=reply_is_bot, language_code=reply_language_code,
-                                                    token=token, chat_id=self.__chat_id)
-        else:
-            self.reply_to_message = None
-        self.from_user = From_user(fullname=fullname, user_id=user_id, username=username, is_bot=is_bot, language_code=language_code)
-        self.chat = Chat(chat_id=chat_id, title=title, username=chat_username, _type=self.__type)
+            raw["reply_to_message"] = {
+                "message_id": reply_to_message_message_id,
+                "from": {"id": reply_to_message_user_id, "first_name": reply_to_message_fullname, "username": username,
+                         "is_bot": reply_is_bot, "language_code": reply_language_code},
+            }
+        self.__setup(raw, token, client)
+
+    @classmethod
+    def from_dict(cls, obj: dict, token: str, client: TelegramClient=None) -> "MessageObject":
+        """Обёртка над словарём Message без разбора полей."""
+        self = cls.__new__(cls)
+        self.__setup(obj, token, client)
+        return self
+
+    @classmethod
+    def from_result(cls, data: Optional[dict], token: str, client: TelegramClient=None) -> Optional["MessageObject"]:
+        """Собирает MessageObject из результата sendMessage/editMessageText."""
+        if not isinstance(data, dict):
+            # Вызов ушёл в ответе на вебхук - сообщения в ответе нет
+            return None
+        return cls.from_dict(data, token=token, client=client)
+
+    def __setup(self, obj: dict, token: str, client: Optional[TelegramClient]) -> None:
+        self.__raw = obj
         self.__token = token
-        self.__url = "https://api.telegram.org/bot" + self.__token + "/"
-        
-        self.session = None
-        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
-    
-    async def start_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=self.ssl_context))
-
-    async def close_session(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
+        self._bind_client(self.__token, client)
+
+    @property
+    def raw(self) -> dict:
+        """Исходный словарь сообщения - для полей без отдельного свойства (document, photo, ...)."""
+        return self.__raw
+
+    @property
+    def message_id(self) -> int:
+        return self.__raw.get("message_id")
+
+    @property
+    def text(self) -> Optional[str]:
+        return self.__raw.get("text")
+
+    @property
+    def caption(self) -> Optional[str]:
+        return self.__raw.get("caption")
+
+    @property
+    def __chat_id(self) -> int:
+        return self.__raw.get("chat", {}).get("id")
+
+    @lazy_property
+    def from_user(self) -> From_user:
+        return From_user.from_dict(self.__raw.get("from", {}))
+
+    @lazy_property
+    def chat(self) -> Chat:
+        return Chat.from_dict(self.__raw.get("chat", {}))
+
+    @lazy_property
+    def reply_to_message(self) -> Optional[Reply_to_message]:
+        reply = self.__raw.get("reply_to_message")
+        if not reply:
+            return None
+        return Reply_to_message.from_dict(reply, chat_id=self.__chat_id, token=self.__token, client=self._client)
     
     async def answer(self, message: str, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
@@ -620,12 +659,10 @@ class MessageObject:
             payload["reply_markup"] = reply_markup
         
         try:
-            async with self.session.post(self.__url + "sendMessage", json=payload) as response:
-                response.raise_for_status()  # Бросает исключение для HTTP-ошибок
-                data = await response.json()
-                loggers.event.info("The message has been sent successfully.")
-                return True
-        except Exception as e:
+            await self._client.call("sendMessage", payload)
+            loggers.event.info("The message has been sent successfully.")
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
@@ -654,12 +691,10 @@ class MessageObject:
             payload["reply_markup"] = reply_markup
 
         try:
-            async with self.session.post(self.__url + "sendMessage", json=payload) as response:
-                response.raise_for_status()
-                data = await response.json()
-                loggers.event.info("The message has been sent successfully.")
-                return True
-        except Exception as e:
+            await self._client.call("sendMessage", payload)
+            loggers.event.info("The message has been sent successfully.")
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
@@ -672,109 +707,67 @@ class MessageObject:
             "message_id": self.message_id,
         }
         try:
-            async with self.session.post(self.__url + "deleteMessage", json=payload) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return True
-                else:
-                    raise TelegramBadRequest((await response.json()).get("description"))
-        except Exception as e:
+            await self._client.call("deleteMessage", payload)
+            return True
+        except AioTeleError as e:
             loggers.event.error(f"{e}")
             return False
         finally:
             await self.close_session()
     
-    async def reply_photo(self, file_path: str=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
+    async def reply_photo(self, file_path: Union[Source, InputFile]=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
             raise ValueError("The 'parse_mode' parameter cannot be None or not a string.")
 
-        if not isinstance(url_photo, str):
+        if file_path is None and not isinstance(url_photo, str):
             raise ValueError("The 'url_photo' parameter cannot be None or not a string.")
         await self.start_session()
         
         try:
-            if file_path:
-                # Чтение файла и создание FormData
-                with open(file_path, "rb") as photo_file:
-                    form_data = aiohttp.FormData()
-                    form_data.add_field("chat_id", str(self.__chat_id))
-                    form_data.add_field("photo", photo_file, filename=file_path.split("/")[-1])
-                    form_data.add_field("parse_mode", parse_mode)
-                    form_data.add_field("reply_to_message_id", self.message_id)
-            else:
-                form_data = aiohttp.FormData()
-                form_data.add_field("chat_id", str(self.__chat_id))
-                form_data.add_field("photo", url_photo)
-                form_data.add_field("parse_mode", parse_mode)
-                form_data.add_field("reply_to_message_id", self.message_id)
-
-            if caption:
-                form_data.add_field("caption", caption)
-
-            if reply_markup:
-                form_data.add_field("reply_markup", reply_markup)
-                
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}sendPhoto", data=form_data) as response:
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.event.info("The photo was successfully sent.")
-                data = await response.json()
-                await self.close_session()
-                return True
-        
-        except aiohttp.ClientError as e:
-            loggers.event.error(f"ERROR: {e}")
-            return False
-        
-        except FileNotFoundError:
-            loggers.event.error(f"ERROR: File not found: {file_path}")
-            return False
+            return await send_photo(self._client, file_path, url_photo, {
+                "chat_id": self.__chat_id,
+                "parse_mode": parse_mode,
+                "caption": caption or None,
+                "reply_markup": reply_markup or None,
+                "reply_to_message_id": self.message_id,
+            })
+        finally:
+            await self.close_session()
     
-    async def answer_photo(self, file_path: str=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
+    async def answer_photo(self, file_path: Union[Source, InputFile]=None, url_photo: str=None, caption: str = None, parse_mode: str="HTML", reply_markup=None):
         if not isinstance(parse_mode, str):
             loggers.event.error(f"Expected 'parse_mode' to be a string, got {type(parse_mode).__name__}")
             return False
 
-        if not isinstance(url_photo, str):
+        if file_path is None and not isinstance(url_photo, str):
             loggers.event.error(f"Expected 'url_photo' to be a string, got {type(url_photo).__name__}")
             return False
         await self.start_session()
         
         try:
-            if file_path:
-                # Чтение файла и создание FormData
-                with open(file_path, "rb") as photo_file:
-                    form_data = aiohttp.FormData()
-                    form_data.add_field("chat_id", str(self.__chat_id))
-                    form_data.add_field("photo", photo_file, filename=file_path.split("/")[-1])
-                    form_data.add_field("parse_mode", parse_mode)
-            else:
-                form_data = aiohttp.FormData()
-                form_data.add_field("chat_id", str(self.__chat_id))
-                form_data.add_field("photo", url_photo)
-                form_data.add_field("parse_mode", parse_mode)
-
-            if caption:
-                form_data.add_field("caption", caption)
-
-            if reply_markup:
-                form_data.add_field("reply_markup", reply_markup)
-            
-            # Отправка запроса
-            async with self.session.post(f"{self.__url}sendPhoto", data=form_data) as response:
-                response.raise_for_status()  # Бросает исключение при HTTP-ошибке
-                loggers.event.info("The photo was successfully sent.")
-                data = await response.json()
-                await self.close_session()
-                return True
-        
-        except aiohttp.ClientError as e:
-            loggers.bot.error(f"ERROR: {e}")
+            return await send_photo(self._client, file_path, url_photo, {
+                "chat_id": self.__chat_id,
+                "parse_mode": parse_mode,
+                "caption": caption or None,
+                "reply_markup": reply_markup or None,
+            }, logger=loggers.bot)
+        finally:
+            await self.close_session()
+    
+    async def answer_media_group(self, media: List[Union[InputMedia, Source, InputFile]], upload_chat_id: Optional[int]=None):
+        await self.start_session()
+
+        try:
+            result = await send_media_group(self._client, self.__chat_id, media, upload_chat_id=upload_chat_id)
+            return [MessageObject.from_result(message, token=self.__token, client=self._client) for message in result]
+        except AioTeleError as e:
+            loggers.event.error(f"ERROR: {e}")
             return False
-        
-        except FileNotFoundError:
-            loggers.bot.error(f"ERROR: File not found: {file_path}")
+        except FileNotFoundError as e:
+            loggers.event.error(f"ERROR: File not found: {e.filename}")
             return False
+        finally:
+            await self.close_session()
     
     async def edit_text(self, text: str):
         if not isinstance(text, str):
@@ -788,17 +781,9 @@ class MessageObject:
         }
         
         try:
-            async with self.session.post(self.__url + "editMessageText", json=payload) as response:
-                if response.status == 200:
-                    data = (await response.json()).get("result")
-                    data_from = data.get("from")
-                    data_chat = data.get("chat")
-                    return MessageObject(message_id=int(data.get("message_id")), fullname=data_from.get("fullname"), username=data_from.get("username"),
-                                        is_bot=data_from.get("is_bot"), message_text=data.get("text"), user_id=data_from.get("id"),
-                                        chat_id=data_chat.get("id"), type_chat=data_chat.get("type"), title=data_chat.get("title", None), chat_username=data_chat.get("username", None), token=self.__token)
-                else:
-                    raise TelegramBadRequest((await response.json()).get("description"))
-        except aiohttp.ClientError as e:
+            result = await self._client.call("editMessageText", payload)
+            return MessageObject.from_result(result, token=self.__token, client=self._client)
+        except TelegramNetworkError as e:
             loggers.event.error(f"ERROR: {e}")
         finally:
             await self.close_session()
@@ -824,58 +809,50 @@ class MessageObject:
             payload["reply_markup"] = reply_markup
 
         try:
-            async with self.session.post(self.__url + "sendDice", json=payload) as response:
-                response.raise_for_status()
-                data = await response.json()
-                # loggers.types.info("The message has been sent successfully.")
-                return Dice(data.get("result"))
-        except Exception as e:
+            result = await self._client.call("sendDice", payload)
+            # loggers.types.info("The message has been sent successfully.")
+            return Dice(result or {})
+        except AioTeleError as e:
             loggers.event.error(f"ERROR: {e}")
         finally:
             await self.close_session()
 
-class CallbackQuery:
-    def __init__(self, obj: dict, token: str):
-        self.id = obj.get("id", None)
-        self.message_json = obj.get("message", {})
-        self.message = MessageObject(
-    is_bot=self.message_json.get("from", {}).get("is_bot", None),
-    reply_is_bot=self.message_json.get("reply_to_message", {}).get("from", {}).get("is_bot", None),
-    language_code=self.message_json.get("from", {}).get("language_code", None),
-    reply_language_code=self.message_json.get("reply_to_message", {}).get("from", {}).get("language_code", None),
-    message_id=self.message_json.get("message_id", None),
-    username=self.message_json.get("from", {}).get("username", None),
-    chat_id=self.message_json.get("chat", {}).get("id", None),
-    title=self.message_json.get("chat", {}).get("title", None),
-    chat_username=self.message_json.get("chat", {}).get("username", None),
-    fullname=self.message_json.get("from", {}).get("first_name", None),
-    user_id=self.message_json.get("from", {}).get("id", None),
-    reply_to_message_fullname=self.message_json.get("reply_to_message", {}).get("from", {}).get("first_name", None),
-    reply_to_message_user_id=self.message_json.get("reply_to_message", {}).get("from", {}).get("id", None),
-    reply_to_message_message_id=self.message_json.get("reply_to_message", {}).get("message_id", None),
-    token=token,
-    type_chat=self.message_json.get("chat", {}).get("type", None),
-    message_text=self.message_json.get("text", None)
-)
-        # self.message = MessageObject(message_id=self.message.get("message_id", None), chat_id=obj.get("message", None).get("chat", None).get("id", None), fullname=self.message.get("from", None).get("first_name", None), user_id=self.message.get("from", None).get("id", None), reply_to_message_fullname=self.message.get("reply_to_message", None).get("from", None).get("first_name", None), reply_to_message_user_id=self.message.get("reply_to_message", None).get("from", None).get("id", None), reply_to_message_message_id=self.message.get("reply_to_message", None).get("message_id", None), token=obj.get("token", None), type_chat=self.message.get("chat", None).get("type", None), message_text=self.message.get("text", None))
-        self.chat_instance = obj.get("chat_instance", None)
-        self.data = obj.get("data", None)
-        self.entities=Entities(self.message_json.get("entities", {})[0])
-        
+class CallbackQuery(_ApiObject):
+    __slots__ = ("__raw", "__token", "_lazy_message", "_lazy_from_user", "_lazy_entities")
+
+    def __init__(self, obj: dict, token: str, client: TelegramClient=None):
+        self.__raw = obj
         self.__token = token
-        self.__url = "https://api.telegram.org/bot" + self.__token + "/"
-        
-        self.session = None
-        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
-    
-    async def start_session(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=self.ssl_context))
+        self._bind_client(self.__token, client)
 
-    async def close_session(self):
-        if self.session:
-            await self.session.close()
-            self.session = None
+    @property
+    def id(self) -> str:
+        return self.__raw.get("id")
+
+    @property
+    def message_json(self) -> dict:
+        return self.__raw.get("message", {})
+
+    @property
+    def chat_instance(self) -> str:
+        return self.__raw.get("chat_instance")
+
+    @property
+    def data(self) -> Optional[str]:
+        return self.__raw.get("data")
+
+    @lazy_property
+    def message(self) -> MessageObject:
+        return MessageObject.from_dict(self.message_json, token=self.__token, client=self._client)
+
+    @lazy_property
+    def from_user(self) -> From_user:
+        return From_user.from_dict(self.__raw.get("from", {}))
+
+    @lazy_property
+    def entities(self) -> Optional[Entities]:
+        entities = self.message_json.get("entities")
+        return Entities(entities[0]) if entities else None
     
     async def answer(self, text: str="", show_alert: bool=False, cache_time: int=0):
         if not isinstance(text, str):
@@ -894,12 +871,10 @@ class CallbackQuery:
             "cache_time": cache_time
         }
         try:
-            async with self.session.post(self.__url + "answerCallbackQuery", json=payload) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return True
-        except Exception as e:
-            raise TelegramBadRequest(e)
+            await self._client.call("answerCallbackQuery", payload)
+            return True
+        except TelegramNetworkError as e:
+            raise TelegramBadRequest(f"{e}")
         finally:
             await self.close_session()
 
@@ -933,9 +908,18 @@ class GetChat:
         self.accent_color_id: int = obj.get("accent_color_id", None)
 
 class CommandObject:
+    __slots__ = ("text_message", "_lazy_args_list")
+
     def __init__(self, text_message: str):
-        self.args = " ".join(text_message.split()[1:])
-        self.args_list = text_message.split()[1:]
+        self.text_message = text_message
+
+    @lazy_property
+    def args_list(self) -> List[str]:
+        return self.text_message.split()[1:]
+
+    @property
+    def args(self) -> str:
+        return " ".join(self.args_list)
 
 class Dice:
     def __init__(self, obj: dict):
@@ -954,3 +938,75 @@ class GetMe:
         self.can_join_groups: bool = obj.get("can_join_groups", None)
         self.can_read_all_group_messages: bool = obj.get("can_read_all_group_messages", None)
         self.supports_inline_queries: bool = obj.get("supports_inline_queries", None)
+
+class File:
+    """Файл, готовый к скачиванию (ответ getFile); ссылка действует не меньше часа."""
+
+    __slots__ = ("file_id", "file_unique_id", "file_size", "file_path")
+
+    def __init__(self, obj: dict):
+        self.file_id: str = obj.get("file_id", None)
+        self.file_unique_id: str = obj.get("file_unique_id", None)
+        self.file_size: int = obj.get("file_size", None)
+        self.file_path: str = obj.get("file_path", None)
+
+# Все типы апдейтов Bot API; в каждом апдейте ровно одно из этих полей
+UPDATE_TYPES = (
+    "message", "edited_message", "channel_post", "edited_channel_post",
+    "business_connection", "business_message", "edited_business_message", "deleted_business_messages",
+    "message_reaction", "message_reaction_count", "inline_query", "chosen_inline_result", "callback_query",
+    "shipping_query", "pre_checkout_query", "purchased_paid_media", "poll", "poll_answer",
+    "my_chat_member", "chat_member", "chat_join_request", "chat_boost", "removed_chat_boost",
+)
+
+# Типы апдейтов, содержащие объект Message - хендлеры получают MessageObject
+MESSAGE_UPDATE_TYPES = frozenset({
+    "message", "edited_message", "channel_post", "edited_channel_post", "business_message", "edited_business_message",
+})
+
+class Update:
+    """
+    Апдейт и его тип. Тип определяется одним проходом по ключам: кроме update_id
+    в апдейте есть только поле события.
+    """
+
+    __slots__ = ("update_id", "type", "event")
+
+    def __init__(self, obj: dict):
+        self.update_id: int = obj.get("update_id")
+        self.type: Optional[str] = None
+        self.event: Optional[dict] = None
+        for key, value in obj.items():
+            if key != "update_id":
+                self.type = key
+                self.event = value
+                break
+
+class TelegramObject:
+    """
+    Обёртка над любым объектом Bot API без отдельного класса (inline_query, poll,
+    chat_join_request, ...). Поля читаются из словаря при обращении, вложенные
+    объекты тоже оборачиваются; отсутствующее поле - None. Поле `from` доступно как `from_user`.
+    """
+
+    __slots__ = ("__raw",)
+
+    def __init__(self, obj: dict):
+        self.__raw = obj
+
+    @property
+    def raw(self) -> dict:
+        return self.__raw
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        value = self.__raw.get("from" if name == "from_user" else name)
+        if isinstance(value, dict):
+            return TelegramObject(value)
+        if isinstance(value, list):
+            return [TelegramObject(item) if isinstance(item, dict) else item for item in value]
+        return value
+
+    def __repr__(self) -> str:
+        return f"TelegramObject({self.__raw!r})"
@@ -0,0 +1,94 @@
+"""
+Сравнение JSON-кодеков на типичных для бота данных: декодирование пакета
+getUpdates и сериализация тела sendMessage с reply_markup.
+
+    python benchmarks/codecs_bench.py [--batch 100] [--number 200]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiotele import codecs
+
+# Те же функции, что выбирает aiotele.codecs; кодек по умолчанию - ровно json_loads/json_dumps бота
+CODECS = {"json": (json.loads, json.dumps)}
+if codecs.orjson is not None:
+    CODECS["orjson"] = (codecs.orjson.loads, codecs._orjson_dumps)
+if codecs.ujson is not None:
+    CODECS["ujson"] = (codecs.ujson.loads, codecs.ujson.dumps)
+CODECS[codecs.CODEC] = (codecs.json_loads, codecs.json_dumps)
+
+
+def make_user(user_id: int) -> dict:
+    return {
+        "id": user_id,
+        "is_bot": False,
+        "first_name": random.choice(["Иван", "Anna", "José", "李"]),
+        "username": f"user{user_id}",
+        "language_code": random.choice(["ru", "en", "es"]),
+    }
+
+
+def make_update(update_id: int) -> dict:
+    user = make_user(random.randint(10**8, 10**10))
+    chat = {"id": user["id"], "first_name": user["first_name"], "username": user["username"], "type": "private"}
+    if random.random() < 0.3:
+        return {
+            "update_id": update_id,
+            "callback_query": {
+                "id": str(random.getrandbits(63)),
+                "from": user,
+                "message": {"message_id": random.randint(1, 10**6), "from": make_user(42), "chat": chat,
+                            "date": 1700000000, "text": "Выберите пункт меню"},
+                "chat_instance": str(random.getrandbits(63)),
+                "data": f"menu:item:{random.randint(1, 100)}",
+            },
+        }
+    text = random.choice(["/start", "/help@testbot", "Привет! Как дела? 👋", "https://example.com " * 5])
+    message = {"message_id": random.randint(1, 10**6), "from": user, "chat": chat, "date": 1700000000, "text": text}
+    if text.startswith("/"):
+        message["entities"] = [{"offset": 0, "length": len(text), "type": "bot_command"}]
+    return {"update_id": update_id, "message": message}
+
+
+def make_payload() -> dict:
+    return {
+        "chat_id": random.randint(10**8, 10**10),
+        "text": "<b>Результат</b>: всё готово ✅ " * 4,
+        "parse_mode": "HTML",
+        "reply_markup": {
+            "inline_keyboard": [
+                [{"text": f"Кнопка {row}-{col}", "callback_data": f"menu:{row}:{col}"} for col in range(3)]
+                for row in range(4)
+            ]
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, default=100, help="апдейтов в одном ответе getUpdates")
+    parser.add_argument("--number", type=int, default=200, help="повторов каждого замера")
+    args = parser.parse_args()
+
+    random.seed(0)
+    body = json.dumps({"ok": True, "result": [make_update(i) for i in range(args.batch)]}).encode()
+    payload = make_payload()
+    print(f"getUpdates body: {len(body)} bytes, {args.batch} updates; {args.number} runs per measurement")
+    print(f"Bot default codec: {codecs.CODEC} (marked with *)")
+    print(f"{'codec':<8} {'loads, ms':>10} {'dumps, us':>10}")
+
+    for name, (loads, dumps) in CODECS.items():
+        loads_time = min(timeit.repeat(lambda: loads(body), number=args.number, repeat=3)) / args.number
+        dumps_time = min(timeit.repeat(lambda: dumps(payload), number=args.number, repeat=3)) / args.number
+        label = name + ("*" if name == codecs.CODEC else "")
+        print(f"{label:<8} {loads_time * 1e3:>10.3f} {dumps_time * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
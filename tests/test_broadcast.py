@@ -0,0 +1,34 @@
+import asyncio
+import random
+
+import pytest
+
+from aiotele.broadcast import Broadcast
+
+
+def test_resume_after_cancel_sends_each_recipient_once(tmp_path):
+    recipients = list(range(1, 101))
+    checkpoint = str(tmp_path / "broadcast.json")
+    sent = []
+    rng = random.Random(0)
+
+    async def send(chat_id: int) -> None:
+        # Разная задержка - получатели завершаются не по порядку
+        await asyncio.sleep(rng.uniform(0.005, 0.05))
+        sent.append(chat_id)
+
+    async def main():
+        first = asyncio.create_task(
+            Broadcast(send, rate=1000, concurrency=5, checkpoint=checkpoint, checkpoint_interval=0.05).run(recipients)
+        )
+        await asyncio.sleep(0.3)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert 0 < len(sent) < len(recipients)
+        return await Broadcast(send, rate=1000, concurrency=5, checkpoint=checkpoint).run(recipients)
+
+    stats = asyncio.run(main())
+    assert sorted(sent) == recipients
+    assert stats.sent == len(recipients)
+    assert stats.failed == stats.blocked == 0